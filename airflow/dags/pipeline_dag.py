@@ -1,5 +1,7 @@
 from airflow import DAG
 from airflow.operators.python import PythonOperator
+from airflow.utils.task_group import TaskGroup
+from airflow.utils.trigger_rule import TriggerRule
 from airflow.providers.postgres.operators.postgres import PostgresOperator
 from datetime import datetime, timedelta
 import sys
@@ -10,8 +12,21 @@ import os
 # ====================================
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
 
-from extract import extract_data_from_all_endpoints
-from transform import transform_and_load_data_from_all_endpoints
+from extract import ENDPOINTS, extract_endpoint
+from transform import transform_and_load_endpoint
+from retention import apply_retention_to_all_endpoints
+from fast_path import PIPELINE_FAST_PATH, extract_transform_load_endpoint
+
+# ====================================
+# Bronze tables read by each silver procedure
+# ====================================
+SILVER_DEPENDENCIES = {
+    'process_dim_products': ['products', 'product_texts', 'product_category_text'],
+    'process_dim_addresses': ['addresses'],
+    'process_dim_partners': ['business_partners'],
+    'process_dim_employees': ['employees'],
+    'process_fact_sales_orders': ['sales_orders', 'sales_order_items'],
+}
 
 # ====================================
 # Default arguments for the DAG
@@ -38,24 +53,59 @@ with DAG(
     schedule_interval='*/5 * * * *',
     start_date=datetime(2025, 7, 1),
     catchup=False,
+    # Runs must not overlap: two loads of an endpoint would race on the
+    # watermark and the load control table, and could merge deltas out of order
+    max_active_runs=1,
     tags=['pipeline', 'etl'],
 ) as dag:
 
-    extract_operator = PythonOperator(
-        task_id='extract_all_endpoints',
-        python_callable=extract_data_from_all_endpoints,
-    )
+    # One extract >> transform_and_load chain per endpoint, so Celery spreads
+    # the endpoints across workers and retries only the failing one. With the
+    # fast path, each endpoint is a single task that keeps its data in memory
+    bronze_tasks = {}
+    for endpoint in ENDPOINTS:
+        with TaskGroup(group_id=endpoint) as endpoint_group:
+            if PIPELINE_FAST_PATH:
+                PythonOperator(
+                    task_id='extract_transform_load',
+                    python_callable=extract_transform_load_endpoint,
+                    op_kwargs={'endpoint': endpoint},
+                )
+            else:
+                extract_operator = PythonOperator(
+                    task_id='extract',
+                    python_callable=extract_endpoint,
+                    op_kwargs={'endpoint': endpoint},
+                )
 
-    transform_operator = PythonOperator(
-        task_id='transform_and_load',
-        python_callable=transform_and_load_data_from_all_endpoints,
-    )
+                transform_operator = PythonOperator(
+                    task_id='transform_and_load',
+                    python_callable=transform_and_load_endpoint,
+                    op_kwargs={'endpoint': endpoint},
+                )
+
+                extract_operator >> transform_operator
+
+        bronze_tasks[endpoint] = endpoint_group
 
-    load_dim_products = PostgresOperator(
-        task_id='load_dim_products',
-        postgres_conn_id='postgres_dw_conn',
-        sql='CALL process_dim_products();'
+    # Compacts and removes old staging snapshots once every endpoint is done with
+    # the bucket, whether or not its load succeeded
+    staging_retention = PythonOperator(
+        task_id='staging_retention',
+        python_callable=apply_retention_to_all_endpoints,
+        trigger_rule=TriggerRule.ALL_DONE,
     )
 
-    # Task dependencies
-    extract_operator >> transform_operator >> load_dim_products
+    # Task dependencies: each silver procedure waits only on the bronze tables it reads.
+    # The procedures are incremental, so a build whose sources were not reloaded is a no-op
+    for procedure, endpoints in SILVER_DEPENDENCIES.items():
+        silver_task = PostgresOperator(
+            task_id=procedure.replace('process_', 'load_'),
+            postgres_conn_id='postgres_dw_conn',
+            sql=f'CALL {procedure}();'
+        )
+
+        for endpoint in endpoints:
+            bronze_tasks[endpoint] >> silver_task
+
+    list(bronze_tasks.values()) >> staging_retention
@@ -0,0 +1,85 @@
+"""
+Compares the Postgres load methods of `load.upload_dataframe_to_postgres`
+on a synthetic frame shaped like the transformed `sales_order_items` table.
+
+Usage (from airflow/scripts, with the DW reachable):
+    python -m benchmarks.load_methods --rows 200000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from load import get_engine, upload_dataframe_to_postgres
+
+
+def make_sales_order_items(rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Builds a synthetic DataFrame with the columns and dtypes of bronze.sales_order_items.
+
+    Args:
+        rows (int): Number of rows.
+        seed (int): Random seed.
+
+    Returns:
+        pd.DataFrame: The synthetic data.
+    """
+    rng = np.random.default_rng(seed)
+    sales_order_id = 500000000 + np.arange(rows) // 5
+    sales_order_item = (np.arange(rows) % 5 + 1) * 10
+    qty = rng.integers(1, 20, rows)
+    gross_price = rng.integers(100, 50000, rows).astype(float)
+    net_price = (gross_price / 1.19).round(2)
+    tax_price = (gross_price - net_price).round(2)
+
+    return pd.DataFrame({
+        'sales_order_id': sales_order_id,
+        'sales_order_item': sales_order_item,
+        'product_id': pd.Series(rng.choice(['MB-1034', 'CB-1161', 'RC-1051', 'DB-1081'], rows)),
+        'currency': 'USD',
+        'gross_price': gross_price,
+        'net_price': net_price,
+        'tax_price': tax_price,
+        'qty': qty,
+        'dt_delivery': pd.Timestamp('2018-01-01') + pd.to_timedelta(rng.integers(0, 2000, rows), unit='D'),
+        'id_sale_line': pd.Series(sales_order_id).astype(str) + '-' + pd.Series(sales_order_item).astype(str),
+        'unit_gross_price': (gross_price / qty).round(2),
+        'unit_net_price': (net_price / qty).round(2),
+        'unit_tax_price': (tax_price / qty).round(2)
+    })
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000, help='Number of synthetic rows')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per method (best time is reported)')
+    parser.add_argument('--schema', default='benchmark', help='Scratch schema for the benchmark tables')
+    args = parser.parse_args()
+
+    df = make_sales_order_items(args.rows)
+
+    with get_engine().begin() as conn:
+        conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS {args.schema}'))
+
+    results = {}
+    for method in ('multi', 'copy'):
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            upload_dataframe_to_postgres(df, f'sales_order_items_{method}', schema=args.schema, method=method)
+            timings.append(time.perf_counter() - start)
+        results[method] = min(timings)
+
+    with get_engine().begin() as conn:
+        conn.execute(text(f'DROP SCHEMA {args.schema} CASCADE'))
+
+    print(f'{args.rows} rows, best of {args.repeat}:')
+    for method, seconds in results.items():
+        print(f'  {method:<6} {seconds:8.2f} s  {args.rows / seconds:12,.0f} rows/s')
+    print(f'  speedup copy vs multi: {results["multi"] / results["copy"]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Compares the former row-wise `apply` derivations of the employees and addresses
+transformers with their vectorized replacements on synthetic frames.
+
+Usage (from airflow/scripts):
+    python -m benchmarks.transform_vectorization --rows 1000000
+"""
+import argparse
+import time
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from transformers.addresses import fix_city_encoding
+from transformers.employees import build_full_name, build_name_initials
+
+
+def make_employees(rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Builds synthetic name columns as the employees transformer sees them
+    (stripped, missing middle names filled with '-').
+
+    Args:
+        rows (int): Number of rows.
+        seed (int): Random seed.
+
+    Returns:
+        pd.DataFrame: The synthetic data.
+    """
+    rng = np.random.default_rng(seed)
+    first_names = ['Derrick', 'Philipp', 'Anna', 'Maria', 'John', 'Yuki', 'Priya', 'Lucas']
+    last_names = ['Magill', 'Egger', 'Smith', 'Schmidt', 'Tanaka', 'Sharma', 'Dubois', 'Brown']
+    middle_names = ['L', 'T', 'A', 'J', '-', '-']
+
+    return pd.DataFrame({
+        'first_name': pd.Series(rng.choice(first_names, rows), dtype='string'),
+        'middle_name': pd.Series(rng.choice(middle_names, rows), dtype='string'),
+        'last_name': pd.Series(rng.choice(last_names, rows), dtype='string'),
+    })
+
+
+def make_cities(rows: int, seed: int = 42) -> pd.Series:
+    """
+    Builds a synthetic city column with UTF-8 names decoded as latin1, as they come from the API.
+
+    Args:
+        rows (int): Number of rows.
+        seed (int): Random seed.
+
+    Returns:
+        pd.Series: The synthetic data.
+    """
+    rng = np.random.default_rng(seed)
+    cities = ['Burr Ridge', 'Flörsheim', 'München', 'Düsseldorf', 'São Paulo', 'Zürich', 'Toronto', None]
+    mangled = [city.encode('utf-8').decode('latin1') if city else None for city in cities]
+
+    return pd.Series(rng.choice(np.array(mangled, dtype=object), rows), dtype='string')
+
+
+def full_name_rowwise(df: pd.DataFrame) -> pd.Series:
+    return df.apply(
+        lambda row: f'{row["first_name"]} ' +
+                    (f'{row["middle_name"]}. ' if row['middle_name'] != '-' else '') +
+                    row['last_name'], axis=1
+    )
+
+
+def name_initials_rowwise(df: pd.DataFrame) -> pd.Series:
+    return df.apply(
+        lambda row: (
+            row['first_name'][0].upper() + '.' +
+            (row['middle_name'][0].upper() + '.' if row['middle_name'] != '-' else '') +
+            row['last_name'][0].upper() + '.'
+        ), axis=1
+    )
+
+
+def city_encoding_rowwise(city: pd.Series) -> pd.Series:
+    return city.apply(lambda x: x.encode('latin1').decode('utf-8') if isinstance(x, str) else x)
+
+
+def best_time(func: Callable, arg, repeat: int) -> tuple[float, pd.Series]:
+    """
+    Runs `func(arg)` `repeat` times.
+
+    Returns:
+        tuple[float, pd.Series]: Best time in seconds and the result of the last run.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(arg)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000, help='Number of synthetic rows')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per implementation (best time is reported)')
+    args = parser.parse_args()
+
+    employees = make_employees(args.rows)
+    cities = make_cities(args.rows)
+
+    cases = {
+        'employees.full_name': (full_name_rowwise, build_full_name, employees),
+        'employees.name_initials': (name_initials_rowwise, build_name_initials, employees),
+        'addresses.city': (city_encoding_rowwise, fix_city_encoding, cities),
+    }
+
+    print(f'{args.rows} rows, best of {args.repeat}:')
+    for name, (rowwise, vectorized, data) in cases.items():
+        rowwise_seconds, expected = best_time(rowwise, data, args.repeat)
+        vectorized_seconds, result = best_time(vectorized, data, args.repeat)
+
+        # Both implementations must produce the same values
+        pd.testing.assert_series_equal(result, expected, check_dtype=False, check_names=False)
+
+        print(
+            f'  {name:<24} row-wise {rowwise_seconds:8.2f} s  vectorized {vectorized_seconds:8.3f} s  '
+            f'speedup {rowwise_seconds / vectorized_seconds:8.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
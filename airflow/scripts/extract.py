@@ -1,13 +1,21 @@
+import hashlib
+import json
 import logging
 import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from io import BytesIO
 
 import boto3
 import pandas as pd
 import requests
 from dotenv import load_dotenv
-from typing import List, Dict
+from requests.adapters import HTTPAdapter
+from typing import Iterator, List, Dict, Optional, Tuple
+from urllib3.util.retry import Retry
+
+from load import get_watermark
+from staging import CHANGED_THROUGH_METADATA, CONTENT_HASH_METADATA, STAGING_BATCH_SIZE, STAGING_FORMAT, MultipartUploadWriter, StagingWriter, apply_staging_schema, serialize_df
 
 
 # Logging configuration
@@ -23,92 +31,651 @@ logger = logging.getLogger(__name__)
 # Load environment variables from .env file
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
 
+# Number of pages fetched in parallel for a single endpoint
+EXTRACT_MAX_WORKERS = int(os.getenv('EXTRACT_MAX_WORKERS', '8'))
+
+# Pagination strategy: 'cursor' follows keyset cursors, 'page' fetches numbered pages concurrently
+EXTRACT_PAGINATION = os.getenv('EXTRACT_PAGINATION', 'cursor')
+
+# Records requested per page, and whether to try the streaming bulk export endpoint first
+EXTRACT_PAGE_SIZE = int(os.getenv('EXTRACT_PAGE_SIZE', '1000'))
+EXTRACT_USE_EXPORT = os.getenv('EXTRACT_USE_EXPORT', 'true').lower() == 'true'
+
+# SAP API endpoints extracted to the staging bucket
+ENDPOINTS = [
+    'addresses',
+    'business_partners',
+    'employees',
+    'product_categories',
+    'product_category_text',
+    'product_texts',
+    'products',
+    'sales_order_items',
+    'sales_orders'
+]
+
+# Incremental mode: endpoints with a change date column only pull rows changed since the last watermark
+EXTRACT_INCREMENTAL = os.getenv('EXTRACT_INCREMENTAL', 'false').lower() == 'true'
+INCREMENTAL_ENDPOINTS = {
+    'business_partners': 'CHANGEDAT',
+    'products': 'CHANGEDAT',
+    'sales_orders': 'CHANGEDAT'
+}
+
+# HTTP session settings for the SAP API
+API_POOL_SIZE = int(os.getenv('API_POOL_SIZE', str(EXTRACT_MAX_WORKERS)))
+API_TIMEOUT = float(os.getenv('API_TIMEOUT', '30'))
+API_MAX_RETRIES = int(os.getenv('API_MAX_RETRIES', '5'))
+API_BACKOFF_FACTOR = float(os.getenv('API_BACKOFF_FACTOR', '0.5'))
+
 
 # Functions
-def extract_page_data(url: str, params: dict) -> List[Dict]:
+def create_api_session(
+    pool_size: int = API_POOL_SIZE,
+    max_retries: int = API_MAX_RETRIES,
+    backoff_factor: float = API_BACKOFF_FACTOR
+) -> requests.Session:
+    """
+    Creates a pooled HTTP session for the SAP API.
+
+    Connections are kept alive and reused across pages and endpoints. Connection
+    errors and 5xx responses are retried with exponential backoff.
+
+    Args:
+        pool_size (int): Maximum number of pooled connections per host.
+        max_retries (int): Maximum number of retries per request.
+        backoff_factor (float): Base delay in seconds for the exponential backoff.
+
+    Returns:
+        requests.Session: A session ready to be shared by all extract calls.
+    """
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def fetch_page(url: str, params: dict, session: Optional[requests.Session] = None) -> Dict:
+    """
+    Fetch a single page of the API and return the full response payload.
+
+    Args:
+        url (str): The full endpoint URL.
+        params (dict): Query parameters, including the page number.
+        session (requests.Session, optional): Pooled session to send the request with.
+
+    Returns:
+        dict: The response body (metadata and results), or empty dict if the page is out of range.
+
+    Raises:
+        requests.HTTPError: If the API still answers with an error after all retries.
+    """
+    http = session or requests
+    response = http.get(url, params=params, timeout=API_TIMEOUT)
+
+    if response.status_code == 404:
+        logger.info(f'Page {params.get("page")} is out of range for {url}.')
+        return {}
+
+    response.raise_for_status()
+    return response.json()
+
+
+def extract_page_data(url: str, params: dict, session: Optional[requests.Session] = None) -> List[Dict]:
     """
     Extract data from a single page of the API.
 
     Args:
         url (str): The full endpoint URL.
         params (dict): Query parameters, including the page number.
+        session (requests.Session, optional): Pooled session to send the request with.
+
+    Returns:
+        list[dict]: A list of records from the page, or empty list if the page is out of range.
+    """
+    return fetch_page(url, params, session).get('results', [])
+
+
+def open_export_stream(url: str, session: requests.Session, filters: Optional[dict] = None) -> Optional[requests.Response]:
+    """
+    Opens a streaming request to the bulk export endpoint (`{url}/export`).
+
+    Args:
+        url (str): The full endpoint URL.
+        session (requests.Session): Pooled session to send the request with.
+        filters (dict, optional): Extra query parameters, e.g. `changed_since`.
 
     Returns:
-        list[dict]: A list of records from the page, or empty list if failed.
+        requests.Response | None: The open NDJSON response, or None if the API has no export endpoint.
     """
-    response = requests.get(url, params=params)
+    params = {'format': 'ndjson', **(filters or {})}
+    response = session.get(f'{url}/export', params=params, timeout=API_TIMEOUT, stream=True)
 
-    if response.status_code != 200:
-        logger.warning(f'Failed to fetch page {params.get("page")}, status code: {response.status_code}')
-        return []
+    if response.status_code == 404:
+        response.close()
+        return None
 
-    return response.json().get('results', [])
+    response.raise_for_status()
+    return response
 
 
-def extract_all_data(base_url: str, endpoint: str) -> pd.DataFrame:
+def iter_export_chunks(response: requests.Response, chunk_size: int = EXTRACT_PAGE_SIZE) -> Iterator[List[Dict]]:
     """
-    Extracts all paginated data from a given API endpoint.
+    Reads an NDJSON export response line by line as it arrives.
+
+    Args:
+        response (requests.Response): Open response returned by `open_export_stream`.
+        chunk_size (int): Number of records per yielded chunk.
+
+    Yields:
+        list[dict]: Chunks of at most `chunk_size` records, in table order.
+    """
+    with response:
+        chunk = []
+
+        for line in response.iter_lines():
+            if not line:
+                continue
+
+            chunk.append(json.loads(line))
+
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+
+def iter_cursor_pages(url: str, next_cursor: str, session: requests.Session, filters: Optional[dict] = None) -> Iterator[List[Dict]]:
+    """
+    Follows `next_cursor` tokens (keyset pagination) until the last page.
+
+    Args:
+        url (str): The full endpoint URL.
+        next_cursor (str): Cursor returned by the first page.
+        session (requests.Session): Pooled session to send the requests with.
+        filters (dict, optional): Extra query parameters, e.g. `changed_since`.
+
+    Yields:
+        list[dict]: Records of every page after the first one, in order.
+    """
+    while next_cursor:
+        params = {'cursor': next_cursor, 'page_size': EXTRACT_PAGE_SIZE, **(filters or {})}
+        payload = fetch_page(url, params=params, session=session)
+        yield payload.get('results', [])
+        next_cursor = payload.get('next_cursor')
+
+
+def check_page(endpoint: str, page: int, future: Future, total_pages: int) -> List[Dict]:
+    """
+    Waits for a page fetched in the background and checks it is not missing.
+
+    Every page before the last one must hold records: an empty or out of range
+    (404) page there means the snapshot would be truncated, and a truncated
+    snapshot would replace the whole bronze table. Only the last page may come
+    back empty, when rows were deleted while the table was being read.
+
+    Args:
+        endpoint (str): The endpoint name, for logging.
+        page (int): The page number.
+        future (Future): Pending result of the page request.
+        total_pages (int): Total number of pages reported by the API.
+
+    Raises:
+        RuntimeError: If a page before the last one returned no data.
+
+    Returns:
+        list[dict]: Records of the page.
+    """
+    page_data = future.result()
+
+    if not page_data and page < total_pages:
+        raise RuntimeError(
+            f'Page {page} of {total_pages} of endpoint "{endpoint}" returned no data, '
+            'the extract would be incomplete.'
+        )
+
+    if not page_data:
+        logger.warning(f'Last page {page} of endpoint "{endpoint}" returned no data.')
+
+    return page_data
+
+
+def iter_numbered_pages(
+    url: str,
+    endpoint: str,
+    total_pages: int,
+    session: requests.Session,
+    max_workers: int,
+    filters: Optional[dict] = None
+) -> Iterator[List[Dict]]:
+    """
+    Fetches pages 2..total_pages concurrently and yields them in page order.
+
+    A missing page before the last one fails the extraction, see `check_page`.
+
+    At most twice `max_workers` pages are in flight or waiting to be consumed,
+    so memory stays bounded by a few pages however slow the consumer is.
+
+    Args:
+        url (str): The full endpoint URL.
+        endpoint (str): The endpoint name, for logging.
+        total_pages (int): Total number of pages reported by the API.
+        session (requests.Session): Pooled session shared by the worker threads.
+        max_workers (int): Maximum number of pages fetched in parallel.
+        filters (dict, optional): Extra query parameters, e.g. `changed_since`.
+
+    Yields:
+        list[dict]: Records of each page, in page order.
+    """
+    pages = range(2, total_pages + 1)
+    workers = max(1, min(max_workers, len(pages)))
+    logger.info(f'Fetching {len(pages)} remaining pages of "{endpoint}" with {workers} workers.')
+
+    def fetch(page: int) -> List[Dict]:
+        params = {'page': page, 'page_size': EXTRACT_PAGE_SIZE, **(filters or {})}
+        return extract_page_data(url, params=params, session=session)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+
+        for page in pages:
+            pending.append((page, executor.submit(fetch, page)))
+
+            if len(pending) >= 2 * workers:
+                yield check_page(endpoint, *pending.popleft(), total_pages)
+
+        while pending:
+            yield check_page(endpoint, *pending.popleft(), total_pages)
+
+
+def iter_endpoint_data(
+    base_url: str,
+    endpoint: str,
+    session: Optional[requests.Session] = None,
+    max_workers: int = EXTRACT_MAX_WORKERS,
+    pagination: str = EXTRACT_PAGINATION,
+    use_export: bool = EXTRACT_USE_EXPORT,
+    filters: Optional[dict] = None
+) -> Iterator[List[Dict]]:
+    """
+    Streams all data of a given API endpoint as chunks of records, in table order.
+
+    When `use_export` is set and the API exposes the bulk export endpoint, the
+    whole table is streamed in a single request. Otherwise the first page is
+    fetched alone to read the response metadata. With cursor pagination (default)
+    the `next_cursor` tokens are then followed, which keeps a full table dump
+    linear on the API side. With page pagination, `total_pages` is read and the
+    remaining pages are fetched concurrently by a bounded thread pool. If the
+    API reports neither, pages are walked one at a time until an empty page.
 
     Args:
         base_url (str): The root URL of the API.
         endpoint (str): The specific endpoint to extract data from.
+        session (requests.Session, optional): Pooled session shared across pages.
+        max_workers (int): Maximum number of pages fetched in parallel.
+        pagination (str): 'cursor' or 'page'.
+        use_export (bool): Try the streaming bulk export endpoint first.
+        filters (dict, optional): Extra query parameters sent with every request, e.g. `changed_since`.
+
+    Yields:
+        list[dict]: Chunks of records (pages, or EXTRACT_PAGE_SIZE records when exporting).
+    """
+    url = f'{base_url}/{endpoint}'
+    session = session or create_api_session()
+
+    if use_export:
+        response = open_export_stream(url, session, filters)
+
+        if response is not None:
+            yield from iter_export_chunks(response)
+            return
+
+        logger.info(f'Export endpoint not available for "{endpoint}", falling back to pagination.')
+
+    filters = filters or {}
+    first_page = fetch_page(url, params={'page': 1, 'page_size': EXTRACT_PAGE_SIZE, **filters}, session=session)
+    first_page_data = first_page.get('results', [])
+    total_pages = first_page.get('total_pages')
+
+    if not first_page_data:
+        logger.info(f'No data found for endpoint "{endpoint}" at page 1.')
+        return
+
+    yield first_page_data
+
+    if pagination == 'cursor' and 'next_cursor' in first_page:
+        yield from iter_cursor_pages(url, first_page['next_cursor'], session, filters)
+
+    elif total_pages is None:
+        page = 2
+
+        while True:
+            page_data = extract_page_data(url, params={'page': page, 'page_size': EXTRACT_PAGE_SIZE, **filters}, session=session)
+
+            if not page_data:
+                logger.info(f'No more data found for endpoint "{endpoint}" at page {page}.')
+                break
+
+            yield page_data
+            page += 1
+
+    elif total_pages > 1:
+        yield from iter_numbered_pages(url, endpoint, total_pages, session, max_workers, filters)
+
+
+def extract_all_data(
+    base_url: str,
+    endpoint: str,
+    session: Optional[requests.Session] = None,
+    max_workers: int = EXTRACT_MAX_WORKERS,
+    pagination: str = EXTRACT_PAGINATION,
+    use_export: bool = EXTRACT_USE_EXPORT
+) -> pd.DataFrame:
+    """
+    Extracts all data from a given API endpoint into a single DataFrame.
+
+    See `iter_endpoint_data` for how the data is fetched. Prefer
+    `extract_endpoint_to_minio` when the data only needs to reach the bucket.
+
+    Args:
+        base_url (str): The root URL of the API.
+        endpoint (str): The specific endpoint to extract data from.
+        session (requests.Session, optional): Pooled session shared across pages.
+        max_workers (int): Maximum number of pages fetched in parallel.
+        pagination (str): 'cursor' or 'page'.
+        use_export (bool): Try the streaming bulk export endpoint first.
 
     Returns:
         pd.DataFrame: A DataFrame containing all extracted data.
     """
-    url = f'{base_url}/{endpoint}'
-    page = 1
     collected_data = []
 
-    while True:
-        params = {'page': page}
-        page_data = extract_page_data(url, params=params)
-
-        if not page_data:
-            logger.info(f'No more data found for endpoint "{endpoint}" at page {page}.')
-            break
+    for chunk in iter_endpoint_data(base_url, endpoint, session, max_workers, pagination, use_export):
+        collected_data.extend(chunk)
 
-        collected_data.extend(page_data)
-        page += 1
-    
     logger.info(f'{len(collected_data)} records collected from endpoint "{endpoint}".')
     return pd.DataFrame(collected_data)
 
 
-def save_df_on_minio_bucket(df: pd.DataFrame, bucket: str, bkt_filepath: str, minio_config: dict) -> None:
+def create_s3_client(minio_config: dict):
     """
-    Uploads a DataFrame as a CSV file to a MinIO bucket.
+    Creates a boto3 S3 client for MinIO.
 
     Args:
-        df (pd.DataFrame): Data to be saved.
-        bucket (str): The name of the bucket.
-        bkt_filepath (str): The destination path inside the bucket.
         minio_config (dict): MinIO connection config (endpoint, access_key, secret_key).
 
     Returns:
-        None
+        botocore.client.S3: The S3 client.
     """
-    s3 = boto3.client(
+    return boto3.client(
         's3',
         endpoint_url=minio_config['endpoint_url'],
         aws_access_key_id=minio_config['access_key'],
         aws_secret_access_key=minio_config['secret_key']
     )
 
-    csv_buffer = BytesIO()
-    df.to_csv(csv_buffer, index=False)
-    csv_buffer.seek(0)
 
-    s3.put_object(Bucket=bucket, Key=bkt_filepath, Body=csv_buffer.getvalue())
+def update_tracked_max(df_chunk: pd.DataFrame, track_max: Optional[str], max_value: Optional[int]) -> Optional[int]:
+    """
+    Returns the maximum of the tracked column seen so far, including a new chunk.
+
+    Args:
+        df_chunk (pd.DataFrame): Typed chunk of records.
+        track_max (str, optional): Raw column whose maximum value is tracked.
+        max_value (int, optional): Maximum of the previous chunks.
+
+    Returns:
+        int | None: The updated maximum (None if not tracked or no value yet).
+    """
+    if track_max and track_max in df_chunk.columns and df_chunk[track_max].notna().any():
+        chunk_max = int(df_chunk[track_max].max())
+        max_value = chunk_max if max_value is None else max(max_value, chunk_max)
+
+    return max_value
+
+
+def extract_endpoint_frame(
+    base_url: str,
+    endpoint: str,
+    session: requests.Session,
+    filters: Optional[dict] = None,
+    track_max: Optional[str] = None
+) -> Tuple[pd.DataFrame, Optional[int]]:
+    """
+    Extracts an endpoint from the API into a single DataFrame, typed with its staging schema.
+
+    Used by the in-process fast path, which hands the frame straight to the transformer
+    instead of reading it back from the staging bucket.
+
+    Args:
+        base_url (str): The root URL of the API.
+        endpoint (str): The specific endpoint to extract data from.
+        session (requests.Session): Pooled session shared across pages.
+        filters (dict, optional): Extra query parameters, e.g. `changed_since`.
+        track_max (str, optional): Raw column whose maximum value is tracked (e.g. 'CHANGEDAT').
+
+    Returns:
+        tuple[pd.DataFrame, int | None]: The records (empty if the endpoint has no data)
+            and maximum of `track_max` (None if not tracked or no data).
+    """
+    chunks = []
+    max_value = None
+
+    for chunk in iter_endpoint_data(base_url, endpoint, session, filters=filters):
+        if not chunk:
+            continue
+
+        df_chunk = apply_staging_schema(pd.DataFrame(chunk), endpoint)
+        chunks.append(df_chunk)
+        max_value = update_tracked_max(df_chunk, track_max, max_value)
+
+    if not chunks:
+        return pd.DataFrame(), max_value
+
+    return pd.concat(chunks, ignore_index=True), max_value
+
+
+def upload_staging_frame(
+    df: pd.DataFrame,
+    endpoint: str,
+    s3,
+    bucket: str,
+    bkt_filepath: str,
+    fmt: str = STAGING_FORMAT,
+    changed_through: Optional[int] = None
+) -> dict:
+    """
+    Writes an extracted DataFrame to the staging bucket and moves the endpoint's
+    latest-object pointer to it.
+
+    The frame is serialized in slices of STAGING_BATCH_SIZE rows (Parquet row groups)
+    and streamed through a multipart upload, so only one slice is serialized at a time.
+
+    Args:
+        df (pd.DataFrame): Typed records of the endpoint.
+        endpoint (str): The API endpoint name.
+        s3 (botocore.client.S3): S3 client for MinIO.
+        bucket (str): The name of the bucket.
+        bkt_filepath (str): The destination path inside the bucket.
+        fmt (str): Staging format, 'parquet' or 'csv'.
+        changed_through (int, optional): Latest change date in the frame, stored with the object.
+
+    Returns:
+        dict: `object_name`, `size` and `content_hash` of the object written.
+    """
+    metadata = {CHANGED_THROUGH_METADATA: str(changed_through)} if changed_through is not None else None
+    upload = MultipartUploadWriter(s3, bucket, bkt_filepath, metadata=metadata)
+    writer = StagingWriter(upload, fmt)
+
+    try:
+        for start in range(0, len(df), STAGING_BATCH_SIZE):
+            writer.write(df.iloc[start:start + STAGING_BATCH_SIZE])
+        writer.close()
+    except Exception:
+        writer.abort()
+        raise
+
+    logger.info(f'{len(df)} records from endpoint "{endpoint}" uploaded to bucket "{bucket}" at path: {bkt_filepath}')
+    write_latest_pointer(s3, bucket, endpoint, bkt_filepath, upload.tell(), upload.content_hash, len(df), changed_through)
+
+    return {'object_name': bkt_filepath, 'size': upload.tell(), 'content_hash': upload.content_hash}
+
+
+def extract_endpoint_to_minio(
+    base_url: str,
+    endpoint: str,
+    session: requests.Session,
+    s3,
+    bucket: str,
+    bkt_filepath: str,
+    fmt: str = STAGING_FORMAT,
+    filters: Optional[dict] = None,
+    track_max: Optional[str] = None
+) -> Tuple[int, Optional[int]]:
+    """
+    Streams an endpoint from the API straight into a MinIO object.
+
+    Chunks of records are typed with the endpoint staging schema, serialized
+    and pushed through an S3 multipart upload as they arrive, so memory stays
+    bounded by a few pages plus one upload part regardless of table size.
+    Nothing is written when the endpoint has no data. Once the object is
+    complete, the endpoint's latest-object pointer is moved to it. The maximum
+    of `track_max` is stored with the object (and its pointer), for the load to
+    record it as the endpoint's watermark.
+
+    Args:
+        base_url (str): The root URL of the API.
+        endpoint (str): The specific endpoint to extract data from.
+        session (requests.Session): Pooled session shared across pages.
+        s3 (botocore.client.S3): S3 client for MinIO.
+        bucket (str): The name of the bucket.
+        bkt_filepath (str): The destination path inside the bucket.
+        fmt (str): Staging format, 'parquet' or 'csv'.
+        filters (dict, optional): Extra query parameters, e.g. `changed_since`.
+        track_max (str, optional): Raw column whose maximum value is tracked (e.g. 'CHANGEDAT').
+
+    Returns:
+        tuple[int, int | None]: Number of records written and maximum of `track_max` (None if not tracked or no data).
+    """
+    writer = None
+    total_records = 0
+    max_value = None
+
+    try:
+        for chunk in iter_endpoint_data(base_url, endpoint, session, filters=filters):
+            if not chunk:
+                continue
+
+            if writer is None:
+                upload = MultipartUploadWriter(s3, bucket, bkt_filepath)
+                writer = StagingWriter(upload, fmt)
+
+            df_chunk = apply_staging_schema(pd.DataFrame(chunk), endpoint)
+            writer.write(df_chunk)
+            total_records += len(chunk)
+            max_value = update_tracked_max(df_chunk, track_max, max_value)
+
+        if writer is not None:
+            if max_value is not None:
+                upload.metadata[CHANGED_THROUGH_METADATA] = str(max_value)
+            writer.close()
+            logger.info(f'{total_records} records from endpoint "{endpoint}" uploaded to bucket "{bucket}" at path: {bkt_filepath}')
+            write_latest_pointer(s3, bucket, endpoint, bkt_filepath, upload.tell(), upload.content_hash, total_records, max_value)
+
+    except Exception:
+        if writer is not None:
+            writer.abort()
+        raise
+
+    return total_records, max_value
+
+
+def save_df_on_minio_bucket(df: pd.DataFrame, bucket: str, bkt_filepath: str, minio_config: dict, fmt: str = STAGING_FORMAT) -> None:
+    """
+    Uploads a DataFrame as a Parquet or CSV file to a MinIO bucket.
+
+    Args:
+        df (pd.DataFrame): Data to be saved.
+        bucket (str): The name of the bucket.
+        bkt_filepath (str): The destination path inside the bucket.
+        minio_config (dict): MinIO connection config (endpoint, access_key, secret_key).
+        fmt (str): Staging format, 'parquet' or 'csv'.
+
+    Returns:
+        None
+    """
+    s3 = create_s3_client(minio_config)
+    body = serialize_df(df, fmt)
+    s3.put_object(Bucket=bucket, Key=bkt_filepath, Body=body, Metadata={CONTENT_HASH_METADATA: hashlib.sha256(body).hexdigest()})
     logger.info(f'FIle uploaded to bucket "{bucket}" at path: {bkt_filepath}')
 
 
-def generate_upload_bkt_path(endpoint: str) -> str:
+def latest_pointer_bkt_path(endpoint: str) -> str:
+    """
+    Returns the path of the latest-object pointer of an endpoint in the staging bucket.
     """
-    Generates a structured file path for the uploaded CSV based on the current date.
+    return f'{endpoint}/_latest.json'
+
+
+def write_latest_pointer(
+    s3,
+    bucket: str,
+    endpoint: str,
+    object_name: str,
+    size: int,
+    content_hash: Optional[str],
+    records: int,
+    changed_through: Optional[int] = None
+) -> None:
+    """
+    Points the endpoint's `_latest.json` to a staging object that has just been uploaded.
+
+    A PUT replaces the pointer atomically, so readers see either the previous or
+    the new object, and only complete objects are ever pointed to.
+
+    Args:
+        s3 (botocore.client.S3): S3 client for MinIO.
+        bucket (str): The name of the bucket.
+        endpoint (str): The API endpoint name.
+        object_name (str): Path of the uploaded object inside the bucket.
+        size (int): Size of the object in bytes.
+        content_hash (str, optional): SHA-256 of the object content.
+        records (int): Number of records in the object.
+        changed_through (int, optional): Latest change date in the object (incremental mode).
+    """
+    body = json.dumps({
+        'object_name': object_name,
+        'size': size,
+        'content_hash': content_hash,
+        'records': records,
+        'changed_through': changed_through,
+        'updated_at': datetime.now().isoformat()
+    })
+    s3.put_object(Bucket=bucket, Key=latest_pointer_bkt_path(endpoint), Body=body.encode())
+
+
+def generate_upload_bkt_path(endpoint: str, fmt: str = STAGING_FORMAT, delta: bool = False) -> str:
+    """
+    Generates a structured file path for the uploaded file based on the current date.
 
     Args:
         endpoint (str): The API endpoint name used as folder name.
+        fmt (str): Staging format, used as file extension.
+        delta (bool): Whether the file only holds rows changed since the last watermark.
     
     Returns:
         str: the complete path inside the bucket.
@@ -118,57 +685,119 @@ def generate_upload_bkt_path(endpoint: str) -> str:
     month = now.strftime("%m")
     timestamp = now.strftime("%Y-%m-%d_%H%M%S")
 
-    filename = f'{endpoint}_{timestamp}.csv'
+    suffix = '_delta' if delta else ''
+
+    filename = f'{endpoint}_{timestamp}{suffix}.{fmt}'
     path = f'{endpoint}/{year}/{month}/{filename}'
 
     return path
 
 
-def extract_data_from_all_endpoints() -> None:
+def get_minio_config() -> dict:
     """
-    Extracts data from all defined endpoints and uploads the resulting DataFrames to a MinIO bucket.
+    Loads the MinIO configuration from environment variables.
 
-    Endpoints are paginated and fetched one by one. Each CSV is saved to a structured folder based on year/month.
-    """
-    ENDPOINTS = [
-        'addresses',
-        'business_partners',
-        'employees',
-        'product_categories',
-        'product_category_text',
-        'product_texts',
-        'products',
-        'sales_order_items',
-        'sales_orders'
-    ]
+    Raises:
+        ValueError: If the MinIO credentials are missing.
 
-    # Load MinIO configuration from environment variables
+    Returns:
+        dict: Endpoint URL and credentials of MinIO.
+    """
     minio_config = {
         'endpoint_url': 'http://minio:9000',
         'access_key': os.getenv('MINIO_ROOT_USER'),
         'secret_key': os.getenv('MINIO_ROOT_PASSWORD')
     }
 
-
     # Basic credentials check
     if not minio_config['access_key'] or not minio_config['secret_key']:
-        logger.error('MinIO credentials are missing. Check your environment variables')
-        return
-    
+        raise ValueError('MinIO credentials are missing. Check your environment variables')
+
+    return minio_config
+
+
+def get_incremental_filters(endpoint: str) -> Tuple[Optional[str], Optional[int], Optional[dict]]:
+    """
+    Works out how an endpoint is extracted: in full, or only the rows changed since its watermark.
+
+    The watermark is the one recorded with the last load of the endpoint (see
+    `load.get_watermark`), so rows extracted but not loaded yet are pulled again.
+
+    Args:
+        endpoint (str): The API endpoint name.
+
+    Returns:
+        tuple: Change date column to track (None outside incremental mode), current
+            watermark (None if there is none yet) and API filters (None for a full extract).
+    """
+    tracking_column = INCREMENTAL_ENDPOINTS.get(endpoint) if EXTRACT_INCREMENTAL else None
+    watermark = get_watermark(endpoint) if tracking_column else None
+    filters = {'changed_since': watermark} if watermark is not None else None
+
+    return tracking_column, watermark, filters
+
+
+def extract_endpoint(endpoint: str, session: requests.Session = None, s3=None) -> int:
+    """
+    Extracts the data of one endpoint and streams it to the MinIO staging bucket.
+
+    The file (Parquet by default, see STAGING_FORMAT) is typed with the endpoint staging schema,
+    uploaded in parts as pages arrive and saved to a structured folder based on year/month.
+
+    In incremental mode (EXTRACT_INCREMENTAL), endpoints listed in INCREMENTAL_ENDPOINTS only pull
+    rows whose change date is on or after their watermark and are saved as `_delta` files. The
+    watermark only moves when the file is loaded into bronze. It is a day, so rows changed on
+    that day are pulled again; loading deltas must therefore be idempotent. Deleted rows are not
+    detected.
+
+    Errors are raised, so a task running this function fails (and is retried) on its own.
+
+    Args:
+        endpoint (str): The API endpoint to extract.
+        session (requests.Session): HTTP session, created if not given.
+        s3: boto3 S3 client, created if not given.
+
+    Returns:
+        int: Number of records extracted.
+    """
     url = 'http://sap-api:8000'
+    session = session or create_api_session()
+    s3 = s3 or create_s3_client(get_minio_config())
 
+    logger.info(f'Extracting data from endpoint: {endpoint}')
+    tracking_column, watermark, filters = get_incremental_filters(endpoint)
 
-    for endpoint in ENDPOINTS:
-        try:
-            logger.info(f'Extracting data from endpoint: {endpoint}')
-            df_endpoint = extract_all_data(url, endpoint)
+    bkt_filepath = generate_upload_bkt_path(endpoint, delta=filters is not None)
+    total_records, _ = extract_endpoint_to_minio(
+        url, endpoint, session, s3, 'staging', bkt_filepath, filters=filters, track_max=tracking_column
+    )
 
-            if df_endpoint.empty:
-                logger.warning(f'No data extracted for endpoint: {endpoint}')
-                continue
+    if total_records == 0 and filters is not None:
+        logger.info(f'No changes since {watermark} for endpoint: {endpoint}')
+    elif total_records == 0:
+        logger.warning(f'No data extracted for endpoint: {endpoint}')
+
+    return total_records
+
+
+def extract_data_from_all_endpoints() -> None:
+    """
+    Extracts data from all defined endpoints and streams them to a MinIO bucket.
 
-            bkt_filepath = generate_upload_bkt_path(endpoint)
-            save_df_on_minio_bucket(df_endpoint, 'staging', bkt_filepath, minio_config)
+    Endpoints are fetched one by one with `extract_endpoint`, sharing one HTTP session and
+    S3 client. A failing endpoint is logged and does not stop the others.
+    """
+    try:
+        minio_config = get_minio_config()
+    except ValueError as e:
+        logger.error(str(e))
+        return
 
+    session = create_api_session()
+    s3 = create_s3_client(minio_config)
+
+    for endpoint in ENDPOINTS:
+        try:
+            extract_endpoint(endpoint, session, s3)
         except Exception as e:
             logger.exception(f'Error processing endpoint "{endpoint}": {str(e)}')
@@ -0,0 +1,140 @@
+import logging
+import os
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Optional
+
+import requests
+
+from extract import (
+    ENDPOINTS,
+    create_api_session,
+    create_s3_client,
+    extract_endpoint_frame,
+    generate_upload_bkt_path,
+    get_incremental_filters,
+    get_minio_config,
+    upload_staging_frame
+)
+from load import record_load, transaction
+from transform import MINIO_CONFIG, TRANSFORMERS, write_bronze_table
+
+
+# Logging configuration
+logging.basicConfig(
+    level=logging.INFO,
+    format='[%(asctime)s] %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+
+# Run extract, transform and load of an endpoint in one task, without reading the data back from MinIO
+PIPELINE_FAST_PATH = os.getenv('PIPELINE_FAST_PATH', 'false').lower() == 'true'
+
+# Staging objects written in the background at the same time
+FAST_PATH_UPLOAD_WORKERS = int(os.getenv('FAST_PATH_UPLOAD_WORKERS', '2'))
+
+
+def extract_transform_load_endpoint(
+    endpoint: str,
+    session: Optional[requests.Session] = None,
+    s3=None,
+    upload_executor: Optional[Executor] = None
+) -> dict:
+    """
+    Extracts, transforms and loads one endpoint in the calling process.
+
+    The typed frame built by the extractor goes straight to the transformer, so the
+    serialize/upload/download/parse round trip through MinIO leaves the critical
+    path. The staging object is still written, on `upload_executor`, while the data
+    is transformed and copied into Postgres, and the load only commits once the
+    object is stored: bronze can always be replayed from the staging bucket. The
+    latest-object pointer and the control table (watermark included) end up exactly
+    as with the staged path, so both paths can be mixed from one run to the next.
+
+    Unlike the staged path, the data is always reloaded (its content hash is only
+    known once the object is written), and the whole endpoint is held in memory.
+
+    Errors are raised, so a task running this function fails (and is retried) on its own.
+
+    Args:
+        endpoint (str): The API endpoint (key of TRANSFORMERS).
+        session (requests.Session): HTTP session, created if not given.
+        s3: boto3 S3 client, created if not given.
+        upload_executor (Executor, optional): Pool writing the staging objects, a
+            single thread if not given.
+
+    Returns:
+        dict: Result of the endpoint (status, object, rows and duration).
+    """
+    url = 'http://sap-api:8000'
+    bucket = MINIO_CONFIG['bucket']
+    session = session or create_api_session()
+    s3 = s3 or create_s3_client(get_minio_config())
+
+    start = time.perf_counter()
+    result = {'endpoint': endpoint, 'status': 'skipped', 'object_name': None, 'rows': None, 'seconds': None, 'error': None}
+
+    logger.info(f'Extracting data from endpoint: {endpoint}')
+    tracking_column, _, filters = get_incremental_filters(endpoint)
+    raw_df, max_changed_at = extract_endpoint_frame(url, endpoint, session, filters, tracking_column)
+
+    if raw_df.empty:
+        logger.info(f'No {"changes" if filters else "data"} extracted for endpoint: {endpoint}, nothing to load.')
+        result['seconds'] = round(time.perf_counter() - start, 2)
+        return result
+
+    object_name = generate_upload_bkt_path(endpoint, delta=filters is not None)
+    own_executor = upload_executor is None
+    upload_executor = upload_executor or ThreadPoolExecutor(max_workers=1)
+
+    try:
+        staged = upload_executor.submit(
+            upload_staging_frame, raw_df, endpoint, s3, bucket, object_name, changed_through=max_changed_at
+        )
+
+        df = TRANSFORMERS[endpoint](raw_df)
+        logger.info(f'{endpoint} transformation complete, DataFrame shape: {df.shape}')
+
+        with transaction() as conn:
+            write_bronze_table(endpoint, df, object_name, conn)
+            record_load(
+                endpoint, object_name, staged.result()['content_hash'], len(df),
+                con=conn, delta=filters is not None, changed_through=max_changed_at
+            )
+
+    finally:
+        if own_executor:
+            upload_executor.shutdown(wait=True)
+
+    logger.info(f'{endpoint} loaded into Postgres from memory, staged at {object_name}.')
+
+    result.update(status='success', object_name=object_name, rows=len(df), seconds=round(time.perf_counter() - start, 2))
+    return result
+
+
+def extract_transform_load_all_endpoints() -> list[dict]:
+    """
+    Runs the fast path for all endpoints, one after another, sharing one HTTP session,
+    S3 client and upload pool. A failing endpoint is logged and does not stop the others.
+
+    Returns:
+        list[dict]: Result of each endpoint, see `extract_transform_load_endpoint`.
+    """
+    session = create_api_session()
+    s3 = create_s3_client(get_minio_config())
+    results = []
+
+    with ThreadPoolExecutor(max_workers=FAST_PATH_UPLOAD_WORKERS) as upload_executor:
+        for endpoint in ENDPOINTS:
+            try:
+                results.append(extract_transform_load_endpoint(endpoint, session, s3, upload_executor))
+            except Exception as e:
+                logger.exception(f'Error processing endpoint "{endpoint}": {str(e)}')
+                results.append({'endpoint': endpoint, 'status': 'failed', 'object_name': None, 'rows': None, 'seconds': None, 'error': str(e)})
+
+    failed = [result['endpoint'] for result in results if result['status'] == 'failed']
+    logger.info(f'Fast path complete: {len(results) - len(failed)} endpoints succeeded or skipped, {len(failed)} failed {failed or ""}')
+
+    return results
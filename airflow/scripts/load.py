@@ -1,36 +1,761 @@
+import csv
+import os
+import re
+import threading
+from contextlib import contextmanager
+from io import BytesIO, StringIO
+from typing import Iterable, Iterator, Optional
+
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
 
 DB_CONFIG = {
-    'user': 'admin',
-    'password': 'admin',
-    'host': 'postgres_dw',
-    'port': '5432',
-    'db': 'bike_sales_dw'
+    'user': os.getenv('DW_USER', 'admin'),
+    'password': os.getenv('DW_PASSWORD', 'admin'),
+    'host': os.getenv('DW_HOST', 'postgres_dw'),
+    'port': os.getenv('DW_PORT', '5432'),
+    'db': os.getenv('DW_DB', 'bike_sales_dw')
+}
+
+# Connection pool of the shared engine
+DB_POOL_CONFIG = {
+    'pool_size': int(os.getenv('DW_POOL_SIZE', '5')),
+    'max_overflow': int(os.getenv('DW_MAX_OVERFLOW', '5')),
+    'pool_recycle': int(os.getenv('DW_POOL_RECYCLE', '1800')),
+    'pool_pre_ping': True
+}
+
+# Insert method used by upload_dataframe_to_postgres: 'copy' (COPY FROM STDIN) or 'multi' (multi-row INSERT)
+LOAD_METHOD = os.getenv('LOAD_METHOD', 'copy')
+
+# Rows sent per COPY statement, which bounds the size of each serialized chunk
+COPY_CHUNKSIZE = int(os.getenv('COPY_CHUNKSIZE', '50000'))
+
+# Marker written by COPY for missing values. Every other field is quoted, so empty
+# strings stay empty strings instead of being read back as NULL
+COPY_NULL = r'\N'
+
+# Suffixes of the tables used by the 'swap' load mode
+SHADOW_SUFFIX = '__shadow'
+OLD_SUFFIX = '__old'
+
+# Natural key (primary key) and join columns (plain indexes) of each bronze table.
+# They are built on the loaded data, before it is swapped in, and kept across loads
+BRONZE_INDEXES = {
+    'addresses': {'primary_key': ['address_id']},
+    'business_partners': {'primary_key': ['partner_id']},
+    'employees': {'primary_key': ['employee_id']},
+    'product_categories': {'primary_key': ['product_category_id']},
+    'product_category_text': {'primary_key': ['product_category_id']},
+    'product_texts': {'primary_key': ['product_id']},
+    'products': {'primary_key': ['product_id'], 'indexes': [['product_category_id']]},
+    'sales_order_items': {'primary_key': ['id_sale_line'], 'indexes': [['sales_order_id']]},
+    'sales_orders': {'primary_key': ['sales_order_id']},
 }
 
-def get_engine():
-    user = DB_CONFIG['user']
-    password = DB_CONFIG['password']
-    host = DB_CONFIG['host']
-    port = DB_CONFIG['port']
-    db = DB_CONFIG['db']
+# Control table recording the last staging object loaded into each bronze table, and
+# log of the keys each merge changed, numbered by load. Not configurable: the silver
+# procedures read them as bronze.load_control and bronze.load_changes (sql/build_log.sql)
+CONTROL_TABLE = 'load_control'
+CHANGES_TABLE = 'load_changes'
+LOAD_ID_SEQUENCE = 'load_id_seq'
+CONTROL_SCHEMA = 'bronze'
+
+# Engine shared by every load of the process, created on first use
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+
+def get_engine() -> Engine:
+    """
+    Returns the process-wide SQLAlchemy engine, creating it on first use.
+
+    The engine keeps a pool of connections (see DB_POOL_CONFIG) that is reused
+    by every load instead of opening new connections per table. Connections
+    are checked with a pre-ping and recycled after `pool_recycle` seconds.
+    """
+    global _engine
+
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                user = DB_CONFIG['user']
+                password = DB_CONFIG['password']
+                host = DB_CONFIG['host']
+                port = DB_CONFIG['port']
+                db = DB_CONFIG['db']
+
+                url = (
+                    f'postgresql+psycopg2://{user}:{password}@{host}:{port}/{db}'
+                )
+
+                _engine = create_engine(url, **DB_POOL_CONFIG)
+
+    return _engine
 
-    url = (
-        f'postgresql+psycopg2://{user}:{password}@{host}:{port}/{db}'
+@contextmanager
+def transaction(con: Optional[Connection] = None) -> Iterator[Connection]:
+    """
+    Opens a transaction on `con`, or on a pooled connection when `con` is None.
+
+    If `con` is already inside a transaction, it is reused as is.
+    """
+    if con is None:
+        with get_engine().begin() as conn:
+            yield conn
+    elif con.in_transaction():
+        yield con
+    else:
+        with con.begin():
+            yield con
+
+def copy_statement(qualified_table: str, columns: Iterable[str]) -> str:
+    """
+    Returns the COPY FROM STDIN statement reading the CSV written by the copy functions.
+
+    Fields are all quoted and missing values are written as COPY_NULL; FORCE_NULL
+    makes COPY match the quoted marker as NULL, while a quoted empty field is
+    loaded as an empty string.
+    """
+    quoted_columns = ', '.join(f'"{col}"' for col in columns)
+
+    return (
+        f'COPY {qualified_table} ({quoted_columns}) FROM STDIN WITH '
+        f"(FORMAT csv, NULL '{COPY_NULL}', FORCE_NULL ({quoted_columns}), ENCODING 'UTF8')"
     )
 
-    return create_engine(url)
+def copy_dataframe(conn: Connection, df: pd.DataFrame, qualified_table: str, chunksize: int = COPY_CHUNKSIZE) -> None:
+    """
+    Appends a DataFrame to an existing table through COPY FROM STDIN.
+
+    The frame is serialized as CSV `chunksize` rows at a time; missing values
+    become COPY_NULL and every field is quoted, so empty strings are kept.
+
+    Args:
+        conn (Connection): Connection (in a transaction) to copy on.
+        df (pd.DataFrame): Data to be copied; its columns must exist in the table.
+        qualified_table (str): Quoted, schema-qualified target table.
+        chunksize (int): Rows serialized and sent per COPY statement.
+    """
+    statement = copy_statement(qualified_table, df.columns)
+
+    with conn.connection.cursor() as cur:
+        for start in range(0, len(df), chunksize):
+            chunk = df.iloc[start:start + chunksize].to_csv(index=False, header=False, quoting=csv.QUOTE_ALL, na_rep=COPY_NULL)
+            cur.copy_expert(statement, BytesIO(chunk.encode('utf-8')))
+
+def copy_insert(table, conn, keys, data_iter):
+    """
+    pandas `to_sql` insertion method that streams rows through COPY FROM STDIN.
 
-def upload_dataframe_to_postgres(df: pd.DataFrame, table_name: str, if_exists='replace', schema=None):
-    engine = get_engine()
+    Each chunk handed over by pandas is written as CSV to an in-memory buffer
+    and sent with a single COPY statement, which is much faster than INSERT.
+    Missing values are written as COPY_NULL and every field is quoted, so empty
+    strings are kept.
 
-    df.to_sql(
-        name=table_name,
-        con=engine,
-        if_exists=if_exists,
-        index=False,
-        schema=schema,
-        method='multi'
+    Args:
+        table (pandas.io.sql.SQLTable): Target table.
+        conn (sqlalchemy.engine.Connection): Connection used by `to_sql`.
+        keys (list[str]): Column names.
+        data_iter (Iterable[tuple]): Rows of the chunk.
+    """
+    buffer = StringIO()
+    csv.writer(buffer, quoting=csv.QUOTE_ALL).writerows(
+        [COPY_NULL if value is None else value for value in row] for row in data_iter
     )
+    payload = BytesIO(buffer.getvalue().encode('utf-8'))
+
+    table_name = f'"{table.schema}"."{table.name}"' if table.schema else f'"{table.name}"'
+
+    with conn.connection.cursor() as cur:
+        cur.copy_expert(copy_statement(table_name, keys), payload)
+
+def qualified_name(table_name: str, schema: Optional[str] = None) -> str:
+    """
+    Returns the quoted, schema-qualified name of a table.
+    """
+    return f'"{schema or "public"}"."{table_name}"'
+
+def get_table_columns(conn: Connection, table_name: str, schema: Optional[str] = None) -> list[str]:
+    """
+    Returns the column names of a table, or an empty list if it does not exist.
+    """
+    result = conn.execute(
+        text(
+            'SELECT column_name FROM information_schema.columns '
+            'WHERE table_schema = :schema AND table_name = :table ORDER BY ordinal_position'
+        ),
+        {'schema': schema or 'public', 'table': table_name}
+    )
+    return [row[0] for row in result]
+
+def get_index_definitions(conn: Connection, table_name: str, schema: Optional[str] = None) -> dict[str, str]:
+    """
+    Returns the indexes of a table as {normalized definition: index name}.
+
+    Index and table names are stripped from the definitions, so the indexes of
+    a table and of a copy made with LIKE ... INCLUDING ALL can be matched.
+    """
+    result = conn.execute(
+        text('SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = :schema AND tablename = :table'),
+        {'schema': schema or 'public', 'table': table_name}
+    )
+    return {re.sub(r' INDEX \S+ ON \S+ ', ' INDEX ON ', indexdef): indexname for indexname, indexdef in result}
+
+def get_table_grants(conn: Connection, table_name: str, schema: Optional[str] = None) -> list[tuple[str, str]]:
+    """
+    Returns the privileges granted on a table to roles other than its owner, as (grantee, privilege).
+    """
+    result = conn.execute(
+        text(
+            "SELECT CASE WHEN acl.grantee = 0 THEN 'PUBLIC' ELSE quote_ident(r.rolname) END, acl.privilege_type "
+            'FROM pg_class c '
+            'JOIN pg_namespace n ON n.oid = c.relnamespace '
+            'CROSS JOIN LATERAL aclexplode(c.relacl) AS acl '
+            'LEFT JOIN pg_roles r ON r.oid = acl.grantee '
+            'WHERE n.nspname = :schema AND c.relname = :table AND acl.grantee <> c.relowner'
+        ),
+        {'schema': schema or 'public', 'table': table_name}
+    )
+    return [(grantee, privilege) for grantee, privilege in result]
+
+def get_indexes(conn: Connection, table_name: str, schema: Optional[str] = None) -> list[tuple[str, bool, bool, list[str]]]:
+    """
+    Returns the indexes of a table as (name, is unique, is primary key, [column names in index order]).
+    """
+    result = conn.execute(
+        text(
+            'SELECT ic.relname, i.indisunique, i.indisprimary, array_agg(a.attname::text ORDER BY k.ord) '
+            'FROM pg_index i '
+            'JOIN pg_class t ON t.oid = i.indrelid '
+            'JOIN pg_class ic ON ic.oid = i.indexrelid '
+            'JOIN pg_namespace n ON n.oid = t.relnamespace '
+            'CROSS JOIN LATERAL unnest(i.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord) '
+            'JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum '
+            'WHERE n.nspname = :schema AND t.relname = :table '
+            'GROUP BY ic.relname, i.indisunique, i.indisprimary'
+        ),
+        {'schema': schema or 'public', 'table': table_name}
+    )
+    return [(name, unique, primary, list(columns)) for name, unique, primary, columns in result]
+
+def copy_indexes(conn: Connection, source_name: str, dest_name: str, schema: Optional[str] = None) -> None:
+    """
+    Builds on `dest_name` the indexes (and primary key) of `source_name`.
+
+    Used once a shadow table is loaded: building an index over the loaded rows
+    is much cheaper than maintaining it row by row during the COPY. The copies
+    are named after the destination table.
+    """
+    dest = qualified_name(dest_name, schema)
+    primary_index = next((name for name, _, primary, _ in get_indexes(conn, source_name, schema) if primary), None)
+
+    for position, (definition, index_name) in enumerate(get_index_definitions(conn, source_name, schema).items()):
+        copy_name = f'{dest_name}_idx{position}'
+        conn.execute(text(definition.replace(' INDEX ON ', f' INDEX "{copy_name}" ON {dest} ', 1)))
+
+        if index_name == primary_index:
+            conn.execute(text(f'ALTER TABLE {dest} ADD CONSTRAINT "{copy_name}" PRIMARY KEY USING INDEX "{copy_name}"'))
+
+def ensure_table_indexes(conn: Connection, table_name: str, schema: Optional[str] = None, primary_key=None, indexes=()) -> None:
+    """
+    Creates the primary key and indexes a table should have, unless it already has them.
+
+    A unique index on exactly the primary key columns is promoted to the primary
+    key, and an index is only created when no existing index starts with its columns.
+
+    Args:
+        conn (Connection): Connection to run the statements on.
+        table_name (str): Table to index, also used to name the new indexes.
+        schema (str, optional): Schema of the table.
+        primary_key (list[str], optional): Primary key columns.
+        indexes (list[list[str]]): Columns of each plain index.
+    """
+    table = qualified_name(table_name, schema)
+    existing = get_indexes(conn, table_name, schema)
+
+    if primary_key and not any(primary for _, _, primary, _ in existing):
+        constraint = f'"{table_name}_pkey"'
+        unique_index = next((name for name, unique, _, columns in existing if unique and columns == list(primary_key)), None)
+
+        if unique_index:
+            conn.execute(text(f'ALTER TABLE {table} ADD CONSTRAINT {constraint} PRIMARY KEY USING INDEX "{unique_index}"'))
+        else:
+            column_list = ', '.join(f'"{col}"' for col in primary_key)
+            conn.execute(text(f'ALTER TABLE {table} ADD CONSTRAINT {constraint} PRIMARY KEY ({column_list})'))
+
+    for columns in indexes:
+        if any(index_columns[:len(columns)] == list(columns) for _, _, _, index_columns in existing):
+            continue
+
+        column_list = ', '.join(f'"{col}"' for col in columns)
+        conn.execute(text(f'CREATE INDEX "{table_name}_{"_".join(columns)}_idx" ON {table} ({column_list})'))
+
+def ensure_unique_key(conn: Connection, table_name: str, key: str, schema: Optional[str] = None) -> None:
+    """
+    Creates a unique index on `key` unless the table already has one, as required by ON CONFLICT.
+    """
+    if any(unique and columns == [key] for _, unique, _, columns in get_indexes(conn, table_name, schema)):
+        return
+
+    conn.execute(text(f'CREATE UNIQUE INDEX "{table_name}_{key}_key" ON {qualified_name(table_name, schema)} ("{key}")'))
+
+def merge_dataframe_into_postgres(df: pd.DataFrame, table_name: str, key: str, schema=None, method=LOAD_METHOD, con: Optional[Connection] = None):
+    """
+    Upserts a DataFrame into a table by its business key.
+
+    The rows are copied into a temporary table (COPY FROM STDIN) and applied with
+    a single INSERT ... ON CONFLICT (key) DO UPDATE, which only rewrites rows
+    whose values actually changed. The cost is proportional to the size of the
+    frame, not of the table, so incremental batches (deltas) are cheap to apply.
+    Rows missing from the frame are left untouched. If the table does not exist
+    yet, it is created from the frame.
+
+    Merges into bronze tables also log the keys they inserted or updated in the
+    changes table, for the silver procedures to rebuild only those rows; they are
+    numbered by the `record_load` of the same transaction.
+
+    Args:
+        df (pd.DataFrame): Rows to insert or update, unique on `key`.
+        table_name (str): Target table.
+        key (str): Business key column the rows are matched on.
+        schema (str, optional): Target schema.
+        method (str): 'copy' or 'multi', used only when the table has to be created.
+        con (Connection, optional): Connection to run the merge on.
+    """
+    target = qualified_name(table_name, schema)
+
+    with transaction(con) as conn:
+        target_columns = get_table_columns(conn, table_name, schema)
+
+        if not target_columns:
+            upload_dataframe_to_postgres(df, table_name, if_exists='fail', schema=schema, method=method, con=conn)
+            ensure_table_indexes(conn, table_name, schema, **BRONZE_INDEXES.get(table_name, {}))
+            ensure_unique_key(conn, table_name, key, schema)
+
+            if schema == CONTROL_SCHEMA:
+                ensure_control_table(conn)
+                conn.execute(
+                    text(
+                        f'INSERT INTO {qualified_name(CHANGES_TABLE, CONTROL_SCHEMA)} (endpoint, key) '
+                        f'SELECT :endpoint, "{key}"::text FROM {target}'
+                    ),
+                    {'endpoint': table_name}
+                )
+            return
+
+        missing_columns = set(df.columns) - set(target_columns)
+        if missing_columns:
+            raise ValueError(f'Columns {sorted(missing_columns)} do not exist in {target}')
+
+        ensure_table_indexes(conn, table_name, schema, **BRONZE_INDEXES.get(table_name, {}))
+        ensure_unique_key(conn, table_name, key, schema)
+
+        # Schema-qualified with pg_temp, so the drop can never reach a regular table of the same name
+        temp_table = f'pg_temp."{table_name}__merge"'
+        # Dropped first, in case an earlier chunk was merged in the same transaction
+        conn.execute(text(f'DROP TABLE IF EXISTS {temp_table}'))
+        conn.execute(text(f'CREATE TEMP TABLE {temp_table} (LIKE {target} INCLUDING DEFAULTS) ON COMMIT DROP'))
+        copy_dataframe(conn, df, temp_table)
+
+        columns = [f'"{col}"' for col in df.columns]
+        updates = [col for col in columns if col != f'"{key}"']
+        column_list = ', '.join(columns)
+
+        if updates:
+            conflict_action = (
+                f"DO UPDATE SET {', '.join(f'{col} = EXCLUDED.{col}' for col in updates)} "
+                f"WHERE ({', '.join(f'{target}.{col}' for col in updates)}) "
+                f"IS DISTINCT FROM ({', '.join(f'EXCLUDED.{col}' for col in updates)})"
+            )
+        else:
+            conflict_action = 'DO NOTHING'
+
+        merge = (
+            f'INSERT INTO {target} ({column_list}) '
+            f'SELECT {column_list} FROM {temp_table} '
+            f'ON CONFLICT ("{key}") {conflict_action}'
+        )
+
+        if schema != CONTROL_SCHEMA:
+            conn.execute(text(merge))
+            return
+
+        # Keys actually inserted or updated, numbered by record_load
+        ensure_control_table(conn)
+        conn.execute(
+            text(
+                f'WITH merged AS ({merge} RETURNING "{key}") '
+                f'INSERT INTO {qualified_name(CHANGES_TABLE, CONTROL_SCHEMA)} (endpoint, key) '
+                f'SELECT :endpoint, "{key}"::text FROM merged'
+            ),
+            {'endpoint': table_name}
+        )
+
+def swap_dataframe_into_postgres(df: pd.DataFrame, table_name: str, schema=None, method=LOAD_METHOD, con: Optional[Connection] = None):
+    """
+    Replaces a table by loading a shadow table and renaming it into place.
+
+    See `swap_chunks_into_postgres`, of which this is the single-frame case.
+
+    Args:
+        df (pd.DataFrame): Data to be loaded.
+        table_name (str): Target table.
+        schema (str, optional): Target schema.
+        method (str): 'copy' or 'multi', see `upload_dataframe_to_postgres`.
+        con (Connection, optional): Connection to run the load on.
+    """
+    swap_chunks_into_postgres([df], table_name, schema=schema, method=method, con=con)
+
+
+def swap_chunks_into_postgres(chunks: Iterable[pd.DataFrame], table_name: str, schema=None, method=LOAD_METHOD, con: Optional[Connection] = None):
+    """
+    Replaces a table by loading a shadow table, chunk by chunk, and renaming it into place.
+
+    Everything runs in one transaction: the shadow table is created (with
+    LIKE ... INCLUDING ALL EXCLUDING INDEXES when the target exists with the
+    same columns, so defaults and constraints are kept), loaded, indexed, and
+    swapped in with two renames. The indexes of the target, and those listed in
+    BRONZE_INDEXES, are built once the data is in rather than maintained during
+    the COPY, and the shadow table is analyzed before the swap so it is
+    queried with fresh statistics. The target is only locked for the renames at the end, and
+    readers see either the previous or the new table, never a missing or
+    partially loaded one. Index names and grants of the previous table are
+    carried over. Views that depend on the table must be recreated by the caller.
+
+    The chunks are consumed lazily, so only one of them needs to be in memory.
+    The layout is decided from the first chunk, which must carry all the columns
+    (possibly with no rows).
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): Data to be loaded, at least one chunk.
+        table_name (str): Target table.
+        schema (str, optional): Target schema.
+        method (str): 'copy' or 'multi', see `upload_dataframe_to_postgres`.
+        con (Connection, optional): Connection to run the load on.
+    """
+    chunks = iter(chunks)
+    first_chunk = next(chunks)
+
+    shadow_name = f'{table_name}{SHADOW_SUFFIX}'
+    old_name = f'{table_name}{OLD_SUFFIX}'
+    target = qualified_name(table_name, schema)
+    shadow = qualified_name(shadow_name, schema)
+
+    with transaction(con) as conn:
+        conn.execute(text(f'DROP TABLE IF EXISTS {shadow}'))
+
+        target_columns = get_table_columns(conn, table_name, schema)
+        keep_layout = bool(target_columns) and set(target_columns) == set(first_chunk.columns)
+
+        if keep_layout:
+            conn.execute(text(f'CREATE TABLE {shadow} (LIKE {target} INCLUDING ALL EXCLUDING INDEXES)'))
+
+        upload_dataframe_to_postgres(
+            first_chunk,
+            shadow_name,
+            if_exists='append' if keep_layout else 'replace',
+            schema=schema,
+            method=method,
+            con=conn
+        )
+
+        for chunk in chunks:
+            upload_dataframe_to_postgres(chunk, shadow_name, if_exists='append', schema=schema, method=method, con=conn)
+
+        if not target_columns:
+            conn.execute(text(f'ALTER TABLE {shadow} RENAME TO "{table_name}"'))
+            ensure_table_indexes(conn, table_name, schema, **BRONZE_INDEXES.get(table_name, {}))
+            conn.execute(text(f'ANALYZE {target}'))
+            return
+
+        if keep_layout:
+            copy_indexes(conn, table_name, shadow_name, schema)
+        ensure_table_indexes(conn, shadow_name, schema, **BRONZE_INDEXES.get(table_name, {}))
+
+        # A new table has no statistics until autovacuum gets to it, so the first
+        # queries after the swap would be planned blind: gather them before
+        conn.execute(text(f'ANALYZE {shadow}'))
+
+        target_indexes = get_index_definitions(conn, table_name, schema)
+        shadow_indexes = get_index_definitions(conn, shadow_name, schema)
+        grants = get_table_grants(conn, table_name, schema)
+
+        conn.execute(text(f'ALTER TABLE {target} RENAME TO "{old_name}"'))
+        conn.execute(text(f'ALTER TABLE {shadow} RENAME TO "{table_name}"'))
+        conn.execute(text(f'DROP TABLE {qualified_name(old_name, schema)}'))
+
+        # Give the copied indexes their original names back, now that the old ones are gone,
+        # and name the new ones after the table rather than the shadow
+        for definition, shadow_index in shadow_indexes.items():
+            target_index = target_indexes.get(definition)
+            if target_index is None and shadow_index.startswith(shadow_name):
+                target_index = table_name + shadow_index[len(shadow_name):]
+            if target_index and target_index != shadow_index:
+                conn.execute(text(f'ALTER INDEX {qualified_name(shadow_index, schema)} RENAME TO "{target_index}"'))
+
+        for grantee, privilege in grants:
+            conn.execute(text(f'GRANT {privilege} ON {target} TO {grantee}'))
+
+def upload_dataframe_to_postgres(
+    df: pd.DataFrame,
+    table_name: str,
+    if_exists='replace',
+    schema=None,
+    method=LOAD_METHOD,
+    con: Optional[Connection] = None,
+    key: Optional[str] = None
+):
+    # 'swap' loads a shadow table and renames it into place, see swap_dataframe_into_postgres
+    if if_exists == 'swap':
+        swap_dataframe_into_postgres(df, table_name, schema=schema, method=method, con=con)
+        return
+
+    # 'merge' upserts the rows by their business key, see merge_dataframe_into_postgres
+    if if_exists == 'merge':
+        if key is None:
+            raise ValueError("A business key is required to merge into a table")
+        merge_dataframe_into_postgres(df, table_name, key, schema=schema, method=method, con=con)
+        return
+
+    # The table DDL is derived from the DataFrame dtypes by to_sql either way; only the row transfer differs
+    if method == 'copy':
+        insert_method, chunksize = copy_insert, COPY_CHUNKSIZE
+    else:
+        insert_method, chunksize = 'multi', None
+
+    with transaction(con) as conn:
+        df.to_sql(
+            name=table_name,
+            con=conn,
+            if_exists=if_exists,
+            index=False,
+            schema=schema,
+            method=insert_method,
+            chunksize=chunksize
+        )
+
+
+def upload_chunks_to_postgres(
+    chunks: Iterable[pd.DataFrame],
+    table_name: str,
+    if_exists='swap',
+    schema=None,
+    method=LOAD_METHOD,
+    con: Optional[Connection] = None,
+    key: Optional[str] = None
+) -> int:
+    """
+    Loads a DataFrame delivered in chunks, in one transaction.
+
+    Same modes as `upload_dataframe_to_postgres`: 'swap' fills the shadow table
+    chunk by chunk before renaming it into place, 'merge' upserts each chunk, and
+    'replace'/'append'/'fail' apply to the first chunk, the others being appended.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): Data to be loaded, consumed lazily.
+        table_name (str): Target table.
+        if_exists (str): Load mode.
+        schema (str, optional): Target schema.
+        method (str): 'copy' or 'multi'.
+        con (Connection, optional): Connection to run the load on.
+        key (str, optional): Business key, required by 'merge'.
+
+    Returns:
+        int: Number of rows loaded.
+    """
+    rows = 0
+
+    def counted(chunks):
+        nonlocal rows
+        for chunk in chunks:
+            rows += len(chunk)
+            yield chunk
+
+    with transaction(con) as conn:
+        if if_exists == 'swap':
+            swap_chunks_into_postgres(counted(chunks), table_name, schema=schema, method=method, con=conn)
+            return rows
+
+        for i, chunk in enumerate(counted(chunks)):
+            mode = if_exists if i == 0 or if_exists == 'merge' else 'append'
+            upload_dataframe_to_postgres(chunk, table_name, if_exists=mode, schema=schema, method=method, con=conn, key=key)
+
+    return rows
+
+
+def ensure_control_table(conn: Connection) -> None:
+    """
+    Creates the load control and changes tables if they do not exist yet.
+
+    Concurrent loads may get here at the same time on the first run, so the
+    creation is serialized with a transaction-level advisory lock.
+    """
+    control_table = qualified_name(CONTROL_TABLE, CONTROL_SCHEMA)
+    changes_table = qualified_name(CHANGES_TABLE, CONTROL_SCHEMA)
+    load_id_sequence = qualified_name(LOAD_ID_SEQUENCE, CONTROL_SCHEMA)
+
+    # The changed_through column is added last, so once it exists everything else does
+    if 'changed_through' in get_table_columns(conn, CONTROL_TABLE, CONTROL_SCHEMA):
+        return
+
+    conn.execute(text('SELECT pg_advisory_xact_lock(hashtext(:name))'), {'name': control_table})
+    conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS {CONTROL_SCHEMA}'))
+    conn.execute(text(f'CREATE SEQUENCE IF NOT EXISTS {load_id_sequence}'))
+    conn.execute(text(
+        f'CREATE TABLE IF NOT EXISTS {control_table} ('
+        'endpoint text PRIMARY KEY, '
+        'object_name text NOT NULL, '
+        'content_hash text, '
+        'rows bigint, '
+        'loaded_at timestamptz NOT NULL DEFAULT now(), '
+        f"load_id bigint NOT NULL DEFAULT nextval('{load_id_sequence}'), "
+        'snapshot_load_id bigint'
+        ')'
+    ))
+    # Control tables created before loads were numbered
+    conn.execute(text(
+        f'ALTER TABLE {control_table} '
+        f"ADD COLUMN IF NOT EXISTS load_id bigint NOT NULL DEFAULT nextval('{load_id_sequence}'), "
+        'ADD COLUMN IF NOT EXISTS snapshot_load_id bigint'
+    ))
+    conn.execute(text(
+        f'CREATE TABLE IF NOT EXISTS {changes_table} ('
+        'endpoint text NOT NULL, '
+        'load_id bigint, '
+        'key text NOT NULL'
+        ')'
+    ))
+    conn.execute(text(f'CREATE INDEX IF NOT EXISTS "{CHANGES_TABLE}_endpoint_load_id_idx" ON {changes_table} (endpoint, load_id)'))
+    # Incremental watermark, committed with the load of the data it covers
+    conn.execute(text(f'ALTER TABLE {control_table} ADD COLUMN IF NOT EXISTS changed_through bigint'))
+
+
+def get_last_loads(con: Optional[Connection] = None) -> dict[str, dict]:
+    """
+    Returns the last staging object loaded for each endpoint.
+
+    Args:
+        con (Connection, optional): Connection to run the query on.
+
+    Returns:
+        dict[str, dict]: Endpoint -> `object_name` and `content_hash` (None if unknown)
+            of its last load (endpoints never loaded are missing).
+    """
+    with transaction(con) as conn:
+        ensure_control_table(conn)
+        rows = conn.execute(text(
+            f'SELECT endpoint, object_name, content_hash FROM {qualified_name(CONTROL_TABLE, CONTROL_SCHEMA)}'
+        ))
+        return {endpoint: {'object_name': object_name, 'content_hash': content_hash} for endpoint, object_name, content_hash in rows}
+
+
+def get_watermark(endpoint: str, con: Optional[Connection] = None) -> Optional[int]:
+    """
+    Returns the incremental watermark of an endpoint: the latest change date (YYYYMMDD)
+    of the data loaded into its bronze table.
+
+    It is recorded by `record_load` in the load transaction, so it never runs ahead
+    of bronze: an extract that was never loaded is pulled again by the next one.
+
+    Args:
+        endpoint (str): Endpoint (bronze table).
+        con (Connection, optional): Connection to run the query on.
+
+    Returns:
+        int | None: The watermark, or None if the endpoint has none yet.
+    """
+    with transaction(con) as conn:
+        ensure_control_table(conn)
+        return conn.execute(
+            text(f'SELECT changed_through FROM {qualified_name(CONTROL_TABLE, CONTROL_SCHEMA)} WHERE endpoint = :endpoint'),
+            {'endpoint': endpoint}
+        ).scalar()
+
+
+def record_watermark(endpoint: str, content_hash: str, changed_through: int, con: Optional[Connection] = None) -> None:
+    """
+    Records the watermark of a staging object that was not loaded because the last
+    load of its endpoint had the same content, so bronze already holds its data.
+
+    Args:
+        endpoint (str): Endpoint (bronze table).
+        content_hash (str): Content hash of the object, checked against the last load.
+        changed_through (int): Latest change date (YYYYMMDD) in the object.
+        con (Connection, optional): Connection to run the statement on.
+    """
+    with transaction(con) as conn:
+        ensure_control_table(conn)
+        conn.execute(
+            text(
+                f'UPDATE {qualified_name(CONTROL_TABLE, CONTROL_SCHEMA)} SET changed_through = :changed_through '
+                'WHERE endpoint = :endpoint AND content_hash = :content_hash'
+            ),
+            {'endpoint': endpoint, 'content_hash': content_hash, 'changed_through': changed_through}
+        )
+
+
+def record_load(
+    endpoint: str,
+    object_name: str,
+    content_hash: Optional[str],
+    rows: int,
+    con: Optional[Connection] = None,
+    delta: bool = False,
+    changed_through: Optional[int] = None
+) -> None:
+    """
+    Records the staging object just loaded for an endpoint.
+
+    Run it on the connection of the load itself, so the record is committed
+    if and only if the data is.
+
+    Each load gets a new, increasing `load_id`. A delta load numbers the keys its
+    merges logged in the changes table; a full snapshot is remembered as
+    `snapshot_load_id` and clears the changes of the endpoint, since the silver
+    procedures rebuild everything read from a replaced table anyway.
+
+    Args:
+        endpoint (str): Endpoint (bronze table) loaded.
+        object_name (str): Staging object loaded.
+        content_hash (str, optional): Content hash of the object, if known.
+        rows (int): Number of rows loaded.
+        con (Connection, optional): Connection to run the statement on.
+        delta (bool): Whether the object was merged (delta) rather than swapped in.
+        changed_through (int, optional): Latest change date (YYYYMMDD) in the object,
+            the next incremental extract starts from it (None outside incremental mode).
+    """
+    with transaction(con) as conn:
+        ensure_control_table(conn)
+        control_table = qualified_name(CONTROL_TABLE, CONTROL_SCHEMA)
+        changes_table = qualified_name(CHANGES_TABLE, CONTROL_SCHEMA)
+
+        # The id of an update is drawn once the row is locked, so the loads of an endpoint are numbered in commit order
+        load_id = conn.execute(
+            text(
+                f'INSERT INTO {control_table} '
+                '(endpoint, object_name, content_hash, rows, loaded_at, changed_through) '
+                'VALUES (:endpoint, :object_name, :content_hash, :rows, now(), :changed_through) '
+                'ON CONFLICT (endpoint) DO UPDATE SET '
+                'object_name = EXCLUDED.object_name, content_hash = EXCLUDED.content_hash, '
+                'rows = EXCLUDED.rows, loaded_at = EXCLUDED.loaded_at, changed_through = EXCLUDED.changed_through, '
+                f"load_id = nextval('{qualified_name(LOAD_ID_SEQUENCE, CONTROL_SCHEMA)}') "
+                'RETURNING load_id'
+            ),
+            {
+                'endpoint': endpoint, 'object_name': object_name, 'content_hash': content_hash,
+                'rows': rows, 'changed_through': changed_through
+            }
+        ).scalar()
 
+        if delta:
+            conn.execute(
+                text(f'UPDATE {changes_table} SET load_id = :load_id WHERE endpoint = :endpoint AND load_id IS NULL'),
+                {'endpoint': endpoint, 'load_id': load_id}
+            )
+        else:
+            conn.execute(
+                text(f'UPDATE {control_table} SET snapshot_load_id = load_id WHERE endpoint = :endpoint'),
+                {'endpoint': endpoint}
+            )
+            conn.execute(text(f'DELETE FROM {changes_table} WHERE endpoint = :endpoint'), {'endpoint': endpoint})
@@ -0,0 +1,362 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from datetime import datetime
+from itertools import groupby
+from typing import Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from extract import ENDPOINTS, create_s3_client, get_minio_config, latest_pointer_bkt_path
+from load import get_last_loads
+from staging import PARQUET_COMPRESSION, STAGING_SCHEMAS, MultipartUploadWriter, iter_staging_batches
+
+
+# Logging configuration
+logging.basicConfig(
+    level=logging.INFO,
+    format='[%(asctime)s] %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+
+# Staging bucket and the prefix of the compacted archives inside it
+STAGING_BUCKET = os.getenv('STAGING_BUCKET', 'staging')
+ARCHIVE_PREFIX = os.getenv('ARCHIVE_PREFIX', 'archive')
+
+# Most recent snapshots kept as-is per endpoint (at least one, the one the transform reads)
+RETENTION_KEEP_LATEST = max(1, int(os.getenv('RETENTION_KEEP_LATEST', '12')))
+
+# Upper bound of expired snapshots handled per endpoint and run, and of keys per bulk delete (S3 allows 1000)
+RETENTION_MAX_OBJECTS = int(os.getenv('RETENTION_MAX_OBJECTS', '2000'))
+RETENTION_DELETE_BATCH = min(1000, int(os.getenv('RETENTION_DELETE_BATCH', '1000')))
+
+# Bytes copied at a time when a snapshot is downloaded to a temporary file
+RETENTION_DOWNLOAD_CHUNK = 8 * 1024 * 1024
+
+# Snapshot file names: {endpoint}_{YYYY-MM-DD}_{HHMMSS}[_delta].{parquet|csv}
+SNAPSHOT_NAME = re.compile(r'^(?P<endpoint>.+)_(?P<day>\d{4}-\d{2}-\d{2})_(?P<time>\d{6})(?P<delta>_delta)?\.(parquet|csv)$')
+
+
+# =============================
+# Snapshot Listing
+# =============================
+def parse_snapshot_name(key: str, endpoint: str) -> Optional[dict]:
+    """
+    Parses the day and time of a staging snapshot from its object name.
+
+    Args:
+        key (str): Object name in the staging bucket.
+        endpoint (str): Endpoint the object is expected to belong to.
+
+    Returns:
+        dict | None: `day` (YYYY-MM-DD) and `time` (HHMMSS) of the snapshot, or None
+            for objects that are not snapshots of the endpoint (pointer, watermark).
+    """
+    match = SNAPSHOT_NAME.match(key.rsplit('/', 1)[-1])
+
+    if match is None or match['endpoint'] != endpoint:
+        return None
+
+    return {'day': match['day'], 'time': match['time']}
+
+
+def list_snapshots(s3, bucket: str, endpoint: str) -> List[dict]:
+    """
+    Lists the staging snapshots of an endpoint, oldest first.
+
+    Args:
+        s3 (botocore.client.S3): S3 client for MinIO.
+        bucket (str): The name of the bucket.
+        endpoint (str): The API endpoint name.
+
+    Returns:
+        list[dict]: `key`, `size`, `day` and `time` of each snapshot.
+    """
+    snapshots = []
+    paginator = s3.get_paginator('list_objects_v2')
+
+    for page in paginator.paginate(Bucket=bucket, Prefix=f'{endpoint}/'):
+        for obj in page.get('Contents', []):
+            parsed = parse_snapshot_name(obj['Key'], endpoint)
+            if parsed is not None:
+                snapshots.append({'key': obj['Key'], 'size': obj['Size'], **parsed})
+
+    # Names embed the extraction timestamp, so key order is chronological
+    return sorted(snapshots, key=lambda snapshot: (snapshot['day'], snapshot['time']))
+
+
+def get_latest_pointer_target(s3, bucket: str, endpoint: str) -> Optional[str]:
+    """
+    Returns the object the endpoint's latest-object pointer refers to, if any.
+    """
+    try:
+        response = s3.get_object(Bucket=bucket, Key=latest_pointer_bkt_path(endpoint))
+    except s3.exceptions.NoSuchKey:
+        return None
+
+    return json.loads(response['Body'].read()).get('object_name')
+
+
+def select_expired_snapshots(
+    snapshots: List[dict],
+    keep_latest: int = RETENTION_KEEP_LATEST,
+    protected: Optional[str] = None,
+    max_objects: int = RETENTION_MAX_OBJECTS,
+    loaded_through: Optional[str] = None
+) -> List[dict]:
+    """
+    Picks the snapshots to compact: all but the `keep_latest` most recent ones,
+    only from days that are over, so each day is compacted once into one archive.
+
+    Snapshots extracted after the last one loaded into bronze are kept whatever
+    their age: the transform still has to merge them, in order.
+
+    Args:
+        snapshots (list[dict]): Snapshots of an endpoint, oldest first.
+        keep_latest (int): Most recent snapshots always kept.
+        protected (str, optional): Object that must never be removed (pointer target).
+        max_objects (int): Maximum number of snapshots returned, oldest first.
+        loaded_through (str, optional): Object name of the last load of the endpoint;
+            None if it was never loaded, then nothing expires.
+
+    Returns:
+        list[dict]: The expired snapshots, oldest first.
+    """
+    today = datetime.now().strftime('%Y-%m-%d')
+    candidates = snapshots[:-keep_latest] if keep_latest > 0 else snapshots
+
+    expired = [
+        snapshot for snapshot in candidates
+        if snapshot['day'] < today and snapshot['key'] != protected
+        and loaded_through is not None and snapshot['key'] <= loaded_through
+    ]
+
+    return expired[:max_objects]
+
+
+# =============================
+# Compaction
+# =============================
+def download_snapshot(s3, bucket: str, key: str) -> Tuple[tempfile.SpooledTemporaryFile, str]:
+    """
+    Downloads a snapshot to a temporary file, hashing it on the way.
+
+    Args:
+        s3 (botocore.client.S3): S3 client for MinIO.
+        bucket (str): The name of the bucket.
+        key (str): Object name of the snapshot.
+
+    Returns:
+        tuple: The temporary file (rewound) and the SHA-256 of its content.
+    """
+    body = s3.get_object(Bucket=bucket, Key=key)['Body']
+    content_hash = hashlib.sha256()
+    file = tempfile.SpooledTemporaryFile(max_size=RETENTION_DOWNLOAD_CHUNK)
+
+    for chunk in iter(lambda: body.read(RETENTION_DOWNLOAD_CHUNK), b''):
+        content_hash.update(chunk)
+        file.write(chunk)
+
+    body.close()
+    file.seek(0)
+
+    return file, content_hash.hexdigest()
+
+
+def archive_bkt_path(endpoint: str, day: str, first_time: str) -> str:
+    """
+    Generates the path of a daily archive, partitioned by endpoint and date.
+
+    Args:
+        endpoint (str): The API endpoint name.
+        day (str): Day of the compacted snapshots (YYYY-MM-DD).
+        first_time (str): Time (HHMMSS) of the first compacted snapshot, so a day
+            compacted over several runs gets one archive per run.
+
+    Returns:
+        str: The complete path inside the bucket.
+    """
+    return f'{ARCHIVE_PREFIX}/{endpoint}/dt={day}/{endpoint}_{day}_{first_time}.parquet'
+
+
+def compact_day(s3, bucket: str, endpoint: str, day: str, snapshots: List[dict], seen_hashes: set) -> dict:
+    """
+    Compacts the snapshots of one day into a single Parquet archive.
+
+    Each snapshot becomes row groups tagged with a `_snapshot` column (its object
+    name). Snapshots whose content hash was already archived are skipped. Only one
+    batch of one snapshot is held in memory at a time.
+
+    Args:
+        s3 (botocore.client.S3): S3 client for MinIO.
+        bucket (str): The name of the bucket.
+        endpoint (str): The API endpoint name.
+        day (str): Day of the snapshots (YYYY-MM-DD).
+        snapshots (list[dict]): Snapshots of the day, oldest first.
+        seen_hashes (set): Content hashes already archived, updated in place.
+
+    Returns:
+        dict: Archive object name (None if nothing new), bytes written, snapshots
+            archived and duplicates skipped.
+    """
+    archive_key = archive_bkt_path(endpoint, day, snapshots[0]['time'])
+    sink = MultipartUploadWriter(s3, bucket, archive_key)
+    writer: Optional[pq.ParquetWriter] = None
+    archived = duplicates = 0
+
+    try:
+        for snapshot in snapshots:
+            file, content_hash = download_snapshot(s3, bucket, snapshot['key'])
+
+            if content_hash in seen_hashes:
+                duplicates += 1
+                file.close()
+                continue
+
+            with file:
+                for table in iter_staging_batches(file, dtypes=STAGING_SCHEMAS.get(endpoint)):
+                    table = table.append_column('_snapshot', pa.array([snapshot['key']] * table.num_rows, pa.string()))
+
+                    if writer is None:
+                        writer = pq.ParquetWriter(sink, table.schema, compression=PARQUET_COMPRESSION)
+                    else:
+                        # Snapshots of another format may type untyped columns differently
+                        table = table.select(writer.schema.names).cast(writer.schema)
+
+                    writer.write_table(table)
+
+            seen_hashes.add(content_hash)
+            archived += 1
+
+        if writer is None:
+            sink.abort()
+            return {'archive': None, 'bytes': 0, 'archived': archived, 'duplicates': duplicates}
+
+        writer.close()
+        sink.close()
+
+    except Exception:
+        sink.abort()
+        raise
+
+    return {'archive': archive_key, 'bytes': sink.tell(), 'archived': archived, 'duplicates': duplicates}
+
+
+def delete_objects(s3, bucket: str, keys: List[str], batch_size: int = RETENTION_DELETE_BATCH) -> List[str]:
+    """
+    Deletes objects with bulk deletes of at most `batch_size` keys.
+
+    Args:
+        s3 (botocore.client.S3): S3 client for MinIO.
+        bucket (str): The name of the bucket.
+        keys (list[str]): Object names to delete.
+        batch_size (int): Keys per request (S3 allows up to 1000).
+
+    Returns:
+        list[str]: The keys that could not be deleted.
+    """
+    failed = []
+
+    for start in range(0, len(keys), batch_size):
+        batch = keys[start:start + batch_size]
+        response = s3.delete_objects(
+            Bucket=bucket,
+            Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+        )
+
+        for error in response.get('Errors', []):
+            logger.warning(f'Could not delete {error["Key"]}: {error.get("Message")}')
+            failed.append(error['Key'])
+
+    return failed
+
+
+# =============================
+# Retention
+# =============================
+def apply_retention(s3, bucket: str, endpoint: str, keep_latest: int = RETENTION_KEEP_LATEST) -> dict:
+    """
+    Applies the retention policy to the snapshots of one endpoint.
+
+    The most recent `keep_latest` snapshots, the one the latest-object pointer
+    refers to and those not loaded into bronze yet are kept. Older snapshots
+    from past days are compacted into one Parquet archive per day under
+    `archive/{endpoint}/dt={day}/`, then deleted.
+    A day is only deleted once its archive is complete.
+
+    Args:
+        s3 (botocore.client.S3): S3 client for MinIO.
+        bucket (str): The name of the bucket.
+        endpoint (str): The API endpoint name.
+        keep_latest (int): Most recent snapshots kept as-is.
+
+    Returns:
+        dict: Metrics of the endpoint (snapshots kept, archived, duplicates, deleted,
+            archives written, bytes deleted, archived and reclaimed).
+    """
+    snapshots = list_snapshots(s3, bucket, endpoint)
+    protected = get_latest_pointer_target(s3, bucket, endpoint)
+    loaded_through = get_last_loads().get(endpoint, {}).get('object_name')
+    expired = select_expired_snapshots(snapshots, keep_latest, protected, loaded_through=loaded_through)
+
+    metrics = {
+        'endpoint': endpoint, 'snapshots': len(snapshots), 'archived': 0, 'duplicates': 0,
+        'deleted': 0, 'archives': 0, 'bytes_deleted': 0, 'bytes_archived': 0, 'bytes_reclaimed': 0
+    }
+    seen_hashes = set()
+
+    for day, day_snapshots in groupby(expired, key=lambda snapshot: snapshot['day']):
+        day_snapshots = list(day_snapshots)
+        result = compact_day(s3, bucket, endpoint, day, day_snapshots, seen_hashes)
+
+        failed = set(delete_objects(s3, bucket, [snapshot['key'] for snapshot in day_snapshots]))
+        deleted = [snapshot for snapshot in day_snapshots if snapshot['key'] not in failed]
+
+        metrics['archived'] += result['archived']
+        metrics['duplicates'] += result['duplicates']
+        metrics['archives'] += result['archive'] is not None
+        metrics['bytes_archived'] += result['bytes']
+        metrics['deleted'] += len(deleted)
+        metrics['bytes_deleted'] += sum(snapshot['size'] for snapshot in deleted)
+
+        logger.info(
+            f'{endpoint} {day}: {len(deleted)} snapshots removed, '
+            f'{result["duplicates"]} duplicates, archive {result["archive"] or "not needed"}'
+        )
+
+    metrics['bytes_reclaimed'] = metrics['bytes_deleted'] - metrics['bytes_archived']
+    return metrics
+
+
+def apply_retention_to_all_endpoints(endpoints: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Applies the retention policy to every endpoint of the staging bucket.
+
+    A failing endpoint is logged and does not stop the others.
+
+    Args:
+        endpoints (list[str], optional): Endpoints to process (all of ENDPOINTS by default).
+
+    Returns:
+        list[dict]: Metrics of each endpoint processed successfully.
+    """
+    s3 = create_s3_client(get_minio_config())
+    results = []
+
+    for endpoint in endpoints or ENDPOINTS:
+        try:
+            results.append(apply_retention(s3, STAGING_BUCKET, endpoint))
+        except Exception as e:
+            logger.exception(f'Error applying retention to endpoint "{endpoint}": {str(e)}')
+
+    deleted = sum(result['deleted'] for result in results)
+    reclaimed = sum(result['bytes_reclaimed'] for result in results)
+    logger.info(f'Retention complete: {deleted} snapshots removed, {reclaimed / 1024 ** 2:.1f} MiB reclaimed')
+
+    return results
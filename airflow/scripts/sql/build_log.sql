@@ -0,0 +1,137 @@
+-- Build_log
+-- Run before the dim_* and fact_* scripts: their procedures use it to rebuild
+-- only the rows whose bronze sources were loaded since their last build.
+CREATE SCHEMA IF NOT EXISTS silver;
+
+CREATE TABLE IF NOT EXISTS silver.build_log (
+	target TEXT PRIMARY KEY,
+	source_loads JSONB,
+	rows_upserted BIGINT,
+	rows_deleted BIGINT,
+	built_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Build logs and helpers from before loads were numbered
+ALTER TABLE silver.build_log ADD COLUMN IF NOT EXISTS source_loads JSONB;
+ALTER TABLE silver.build_log DROP COLUMN IF EXISTS source_state;
+DROP FUNCTION IF EXISTS silver.source_state(TEXT[]);
+DROP FUNCTION IF EXISTS silver.is_up_to_date(TEXT, TEXT);
+DROP PROCEDURE IF EXISTS silver.record_build(TEXT, TEXT, BIGINT, BIGINT);
+
+-- Last load of each of a set of bronze tables, as {endpoint: load_id}, from the
+-- load control table the loader keeps (NULL while it does not exist yet). The
+-- names are fixed on both sides, see CONTROL_SCHEMA, CONTROL_TABLE and
+-- CHANGES_TABLE in load.py
+CREATE OR REPLACE FUNCTION silver.source_loads(p_sources TEXT[])
+RETURNS JSONB
+LANGUAGE plpgsql STABLE AS $$
+DECLARE
+	v_loads JSONB;
+BEGIN
+	IF to_regclass('bronze.load_changes') IS NULL THEN
+		RETURN NULL;
+	END IF;
+
+	EXECUTE
+		'SELECT jsonb_object_agg(endpoint, load_id)
+		FROM bronze.load_control
+		WHERE endpoint = ANY($1)'
+	INTO v_loads
+	USING p_sources;
+
+	RETURN v_loads;
+END;
+$$;
+
+-- Whether a target was already built from these exact loads
+CREATE OR REPLACE FUNCTION silver.is_up_to_date(p_target TEXT, p_loads JSONB)
+RETURNS BOOLEAN
+LANGUAGE sql STABLE AS $$
+	SELECT EXISTS (
+		SELECT 1
+		FROM silver.build_log
+		WHERE target = p_target
+		AND source_loads = p_loads
+	);
+$$;
+
+-- Whether a target has to be rebuilt from its whole sources: it was never built,
+-- or one of its sources was replaced by a full snapshot (or first loaded) since.
+-- Otherwise only delta loads happened, and the keys they changed are enough
+CREATE OR REPLACE FUNCTION silver.needs_full_build(p_target TEXT, p_sources TEXT[])
+RETURNS BOOLEAN
+LANGUAGE plpgsql STABLE AS $$
+DECLARE
+	v_built JSONB;
+	v_full BOOLEAN;
+BEGIN
+	SELECT source_loads INTO v_built
+	FROM silver.build_log
+	WHERE target = p_target;
+
+	IF v_built IS NULL OR to_regclass('bronze.load_changes') IS NULL THEN
+		RETURN TRUE;
+	END IF;
+
+	EXECUTE
+		'SELECT bool_or(NOT $2 ? endpoint OR snapshot_load_id > ($2 ->> endpoint)::bigint)
+		FROM bronze.load_control
+		WHERE endpoint = ANY($1)'
+	INTO v_full
+	USING p_sources, v_built;
+
+	RETURN coalesce(v_full, FALSE);
+END;
+$$;
+
+-- Keys of a bronze table changed by the delta loads since a target was last built
+CREATE OR REPLACE FUNCTION silver.changed_keys(p_target TEXT, p_source TEXT)
+RETURNS TEXT[]
+LANGUAGE plpgsql STABLE AS $$
+DECLARE
+	v_built BIGINT;
+	v_keys TEXT[];
+BEGIN
+	SELECT (source_loads ->> p_source)::bigint INTO v_built
+	FROM silver.build_log
+	WHERE target = p_target;
+
+	EXECUTE
+		'SELECT coalesce(array_agg(DISTINCT key), ''{}'')
+		FROM bronze.load_changes
+		WHERE endpoint = $1
+		AND load_id > $2'
+	INTO v_keys
+	USING p_source, coalesce(v_built, 0);
+
+	RETURN v_keys;
+END;
+$$;
+
+-- Records a build, then drops the changes every target reading them has built
+CREATE OR REPLACE PROCEDURE silver.record_build(p_target TEXT, p_loads JSONB, p_upserted BIGINT, p_deleted BIGINT)
+LANGUAGE plpgsql AS $$
+BEGIN
+	INSERT INTO silver.build_log (target, source_loads, rows_upserted, rows_deleted, built_at)
+	VALUES (p_target, p_loads, p_upserted, p_deleted, now())
+	ON CONFLICT (target) DO UPDATE SET
+		source_loads = EXCLUDED.source_loads,
+		rows_upserted = EXCLUDED.rows_upserted,
+		rows_deleted = EXCLUDED.rows_deleted,
+		built_at = EXCLUDED.built_at;
+
+	IF p_loads IS NULL THEN
+		RETURN;
+	END IF;
+
+	EXECUTE
+		'DELETE FROM bronze.load_changes AS chg
+		WHERE chg.endpoint IN (SELECT jsonb_object_keys($1))
+		AND chg.load_id <= (
+			SELECT min((log.source_loads ->> chg.endpoint)::bigint)
+			FROM silver.build_log AS log
+			WHERE log.source_loads ? chg.endpoint
+		)'
+	USING p_loads;
+END;
+$$;
@@ -1,6 +1,6 @@
 -- Active: 1753915504673@@127.0.0.1@5434@bike_sales_dw
 -- Dim_addresses
-CREATE OR REPLACE silver.dim_addresses TABLE AS
+CREATE TABLE IF NOT EXISTS silver.dim_addresses AS
 SELECT
 	ad.address_id,
 	ad.street,
@@ -12,4 +12,100 @@ SELECT
 	ad.latitude,
 	ad.longitude
 FROM
-	bronze.addresses as ad;
+	bronze.addresses as ad
+WITH NO DATA;
+
+-- Key used by the incremental upsert
+DO $$
+BEGIN
+	IF NOT EXISTS (
+		SELECT 1 FROM pg_constraint
+		WHERE conrelid = 'silver.dim_addresses'::regclass AND contype = 'p'
+	) THEN
+		ALTER TABLE silver.dim_addresses ADD PRIMARY KEY (address_id);
+	END IF;
+END;
+$$;
+
+--Procedure
+-- Incremental build: nothing is done unless a source table was loaded since the
+-- last build. After a full snapshot everything is rebuilt and vanished rows are
+-- deleted; after delta loads only the keys they changed are rebuilt
+CREATE OR REPLACE PROCEDURE process_dim_addresses()
+LANGUAGE plpgsql AS $$
+DECLARE
+	v_loads JSONB := silver.source_loads(ARRAY['addresses']);
+	v_full BOOLEAN;
+	v_keys BIGINT[];
+	v_upserted BIGINT;
+	v_deleted BIGINT;
+BEGIN
+	IF silver.is_up_to_date('dim_addresses', v_loads) THEN
+		RETURN;
+	END IF;
+
+	v_full := silver.needs_full_build('dim_addresses', ARRAY['addresses']);
+
+	IF NOT v_full THEN
+		v_keys := silver.changed_keys('dim_addresses', 'addresses')::BIGINT[];
+	END IF;
+
+	WITH source AS (
+		SELECT
+			ad.address_id,
+			ad.street,
+			ad.building,
+			ad.postal_code,
+			ad.city,
+			ad.country,
+			ad.region,
+			ad.latitude,
+			ad.longitude
+		FROM
+			bronze.addresses as ad
+		WHERE
+			v_full OR ad.address_id = ANY(v_keys)
+	),
+	upserted AS (
+		INSERT INTO silver.dim_addresses AS tgt (
+			address_id,
+			street,
+			building,
+			postal_code,
+			city,
+			country,
+			region,
+			latitude,
+			longitude
+		)
+		SELECT * FROM source
+		ON CONFLICT (address_id) DO UPDATE SET
+			street = EXCLUDED.street,
+			building = EXCLUDED.building,
+			postal_code = EXCLUDED.postal_code,
+			city = EXCLUDED.city,
+			country = EXCLUDED.country,
+			region = EXCLUDED.region,
+			latitude = EXCLUDED.latitude,
+			longitude = EXCLUDED.longitude
+		WHERE
+			(tgt.street, tgt.building, tgt.postal_code, tgt.city, tgt.country, tgt.region,
+			 tgt.latitude, tgt.longitude)
+			IS DISTINCT FROM
+			(EXCLUDED.street, EXCLUDED.building, EXCLUDED.postal_code, EXCLUDED.city,
+			 EXCLUDED.country, EXCLUDED.region, EXCLUDED.latitude, EXCLUDED.longitude)
+		RETURNING 1
+	),
+	deleted AS (
+		DELETE FROM silver.dim_addresses AS tgt
+		-- Delta loads never remove rows, only a snapshot can
+		WHERE v_full
+		AND NOT EXISTS (SELECT 1 FROM source WHERE source.address_id = tgt.address_id)
+		RETURNING 1
+	)
+	SELECT (SELECT count(*) FROM upserted), (SELECT count(*) FROM deleted)
+	INTO v_upserted, v_deleted;
+
+	CALL silver.record_build('dim_addresses', v_loads, v_upserted, v_deleted);
+END;
+$$;
@@ -1,6 +1,6 @@
 -- Active: 1753915504673@@127.0.0.1@5434@bike_sales_dw
 -- Dim_employees
-CREATE OR REPLACE silver.dim_employees TABLE AS
+CREATE TABLE IF NOT EXISTS silver.dim_employees AS
 SELECT
 	e.employee_id,
 	e.address_id,
@@ -12,4 +12,100 @@ SELECT
 	e.email_address,
 	e.gender
 FROM
-	bronze.employees AS e;
+	bronze.employees AS e
+WITH NO DATA;
+
+-- Key used by the incremental upsert
+DO $$
+BEGIN
+	IF NOT EXISTS (
+		SELECT 1 FROM pg_constraint
+		WHERE conrelid = 'silver.dim_employees'::regclass AND contype = 'p'
+	) THEN
+		ALTER TABLE silver.dim_employees ADD PRIMARY KEY (employee_id);
+	END IF;
+END;
+$$;
+
+--Procedure
+-- Incremental build: nothing is done unless a source table was loaded since the
+-- last build. After a full snapshot everything is rebuilt and vanished rows are
+-- deleted; after delta loads only the keys they changed are rebuilt
+CREATE OR REPLACE PROCEDURE process_dim_employees()
+LANGUAGE plpgsql AS $$
+DECLARE
+	v_loads JSONB := silver.source_loads(ARRAY['employees']);
+	v_full BOOLEAN;
+	v_keys BIGINT[];
+	v_upserted BIGINT;
+	v_deleted BIGINT;
+BEGIN
+	IF silver.is_up_to_date('dim_employees', v_loads) THEN
+		RETURN;
+	END IF;
+
+	v_full := silver.needs_full_build('dim_employees', ARRAY['employees']);
+
+	IF NOT v_full THEN
+		v_keys := silver.changed_keys('dim_employees', 'employees')::BIGINT[];
+	END IF;
+
+	WITH source AS (
+		SELECT
+			e.employee_id,
+			e.address_id,
+			e.first_name,
+			e.last_name,
+			e.full_name,
+			e.name_initials,
+			e.login_name,
+			e.email_address,
+			e.gender
+		FROM
+			bronze.employees AS e
+		WHERE
+			v_full OR e.employee_id = ANY(v_keys)
+	),
+	upserted AS (
+		INSERT INTO silver.dim_employees AS tgt (
+			employee_id,
+			address_id,
+			first_name,
+			last_name,
+			full_name,
+			name_initials,
+			login_name,
+			email_address,
+			gender
+		)
+		SELECT * FROM source
+		ON CONFLICT (employee_id) DO UPDATE SET
+			address_id = EXCLUDED.address_id,
+			first_name = EXCLUDED.first_name,
+			last_name = EXCLUDED.last_name,
+			full_name = EXCLUDED.full_name,
+			name_initials = EXCLUDED.name_initials,
+			login_name = EXCLUDED.login_name,
+			email_address = EXCLUDED.email_address,
+			gender = EXCLUDED.gender
+		WHERE
+			(tgt.address_id, tgt.first_name, tgt.last_name, tgt.full_name, tgt.name_initials,
+			 tgt.login_name, tgt.email_address, tgt.gender)
+			IS DISTINCT FROM
+			(EXCLUDED.address_id, EXCLUDED.first_name, EXCLUDED.last_name, EXCLUDED.full_name,
+			 EXCLUDED.name_initials, EXCLUDED.login_name, EXCLUDED.email_address, EXCLUDED.gender)
+		RETURNING 1
+	),
+	deleted AS (
+		DELETE FROM silver.dim_employees AS tgt
+		-- Delta loads never remove rows, only a snapshot can
+		WHERE v_full
+		AND NOT EXISTS (SELECT 1 FROM source WHERE source.employee_id = tgt.employee_id)
+		RETURNING 1
+	)
+	SELECT (SELECT count(*) FROM upserted), (SELECT count(*) FROM deleted)
+	INTO v_upserted, v_deleted;
+
+	CALL silver.record_build('dim_employees', v_loads, v_upserted, v_deleted);
+END;
+$$;
@@ -1,6 +1,6 @@
 -- Active: 1753915504673@@127.0.0.1@5434@bike_sales_dw
 -- Dim_partners
-CREATE OR REPLACE silver.dim_partners TABLE AS
+CREATE TABLE IF NOT EXISTS silver.dim_partners AS
 SELECT
 	bp.partner_id,
 	bp.address_id,
@@ -8,4 +8,86 @@ SELECT
 	bp.email_address,
 	bp.currency
 FROM
-	bronze.business_partners AS bp;
+	bronze.business_partners AS bp
+WITH NO DATA;
+
+-- Key used by the incremental upsert
+DO $$
+BEGIN
+	IF NOT EXISTS (
+		SELECT 1 FROM pg_constraint
+		WHERE conrelid = 'silver.dim_partners'::regclass AND contype = 'p'
+	) THEN
+		ALTER TABLE silver.dim_partners ADD PRIMARY KEY (partner_id);
+	END IF;
+END;
+$$;
+
+--Procedure
+-- Incremental build: nothing is done unless a source table was loaded since the
+-- last build. After a full snapshot everything is rebuilt and vanished rows are
+-- deleted; after delta loads only the keys they changed are rebuilt
+CREATE OR REPLACE PROCEDURE process_dim_partners()
+LANGUAGE plpgsql AS $$
+DECLARE
+	v_loads JSONB := silver.source_loads(ARRAY['business_partners']);
+	v_full BOOLEAN;
+	v_keys BIGINT[];
+	v_upserted BIGINT;
+	v_deleted BIGINT;
+BEGIN
+	IF silver.is_up_to_date('dim_partners', v_loads) THEN
+		RETURN;
+	END IF;
+
+	v_full := silver.needs_full_build('dim_partners', ARRAY['business_partners']);
+
+	IF NOT v_full THEN
+		v_keys := silver.changed_keys('dim_partners', 'business_partners')::BIGINT[];
+	END IF;
+
+	WITH source AS (
+		SELECT
+			bp.partner_id,
+			bp.address_id,
+			bp.company_name,
+			bp.email_address,
+			bp.currency
+		FROM
+			bronze.business_partners AS bp
+		WHERE
+			v_full OR bp.partner_id = ANY(v_keys)
+	),
+	upserted AS (
+		INSERT INTO silver.dim_partners AS tgt (
+			partner_id,
+			address_id,
+			company_name,
+			email_address,
+			currency
+		)
+		SELECT * FROM source
+		ON CONFLICT (partner_id) DO UPDATE SET
+			address_id = EXCLUDED.address_id,
+			company_name = EXCLUDED.company_name,
+			email_address = EXCLUDED.email_address,
+			currency = EXCLUDED.currency
+		WHERE
+			(tgt.address_id, tgt.company_name, tgt.email_address, tgt.currency)
+			IS DISTINCT FROM
+			(EXCLUDED.address_id, EXCLUDED.company_name, EXCLUDED.email_address, EXCLUDED.currency)
+		RETURNING 1
+	),
+	deleted AS (
+		DELETE FROM silver.dim_partners AS tgt
+		-- Delta loads never remove rows, only a snapshot can
+		WHERE v_full
+		AND NOT EXISTS (SELECT 1 FROM source WHERE source.partner_id = tgt.partner_id)
+		RETURNING 1
+	)
+	SELECT (SELECT count(*) FROM upserted), (SELECT count(*) FROM deleted)
+	INTO v_upserted, v_deleted;
+
+	CALL silver.record_build('dim_partners', v_loads, v_upserted, v_deleted);
+END;
+$$;
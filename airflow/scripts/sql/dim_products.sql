@@ -1,6 +1,6 @@
 -- Active: 1754439353175@@127.0.0.1@5434@bike_sales_dw
 -- Dim_products
-CREATE TABLE silver.dim_products AS
+CREATE TABLE IF NOT EXISTS silver.dim_products AS
 SELECT
     prd.product_id,
     prd.supplier_partner_id,
@@ -17,42 +17,115 @@ INNER JOIN
     ON prd_cat.product_category_id = prd.product_category_id
 INNER JOIN
     bronze.product_texts AS prd_txt
-    ON prd_txt.product_id = prd.product_id;
+    ON prd_txt.product_id = prd.product_id
+WITH NO DATA;
+
+-- Key used by the incremental upsert (tables created before it existed get it here)
+DO $$
+BEGIN
+	IF NOT EXISTS (
+		SELECT 1 FROM pg_constraint
+		WHERE conrelid = 'silver.dim_products'::regclass AND contype = 'p'
+	) THEN
+		ALTER TABLE silver.dim_products ADD PRIMARY KEY (product_id);
+	END IF;
+END;
+$$;
 
 --Procedure
+-- Incremental build: nothing is done unless a source table was loaded since the
+-- last build. After a full snapshot everything is rebuilt and vanished rows are
+-- deleted; after delta loads only the products whose rows, texts or category
+-- text they changed are rebuilt
 CREATE OR REPLACE PROCEDURE process_dim_products()
 LANGUAGE plpgsql AS $$
+DECLARE
+	v_sources TEXT[] := ARRAY['products', 'product_texts', 'product_category_text'];
+	v_loads JSONB := silver.source_loads(v_sources);
+	v_full BOOLEAN;
+	v_keys TEXT[];
+	v_upserted BIGINT;
+	v_deleted BIGINT;
 BEGIN
-	TRUNCATE TABLE silver.dim_products;
+	IF silver.is_up_to_date('dim_products', v_loads) THEN
+		RETURN;
+	END IF;
+
+	v_full := silver.needs_full_build('dim_products', v_sources);
+
+	IF NOT v_full THEN
+		v_keys := ARRAY(
+			SELECT unnest(silver.changed_keys('dim_products', 'products'))
+			UNION
+			SELECT unnest(silver.changed_keys('dim_products', 'product_texts'))
+			UNION
+			SELECT prd.product_id
+			FROM bronze.products AS prd
+			WHERE prd.product_category_id = ANY(silver.changed_keys('dim_products', 'product_category_text'))
+		);
+	END IF;
+
+	WITH source AS (
+		SELECT
+			prd.product_id,
+			prd.supplier_partner_id,
+			prd_cat.category_short_description,
+			prd_txt.product_description,
+			prd.unit_price,
+			prd.currency,
+			prd.weight_measure,
+			prd.unit
+		FROM
+			bronze.products as prd
+		INNER JOIN
+			bronze.product_category_text AS prd_cat
+		ON
+			prd_cat.product_category_id = prd.product_category_id
+		INNER JOIN
+			bronze.product_texts AS prd_txt
+		ON
+			prd_txt.product_id = prd.product_id
+		WHERE
+			v_full OR prd.product_id = ANY(v_keys)
+	),
+	upserted AS (
+		INSERT INTO silver.dim_products AS tgt (
+			product_id,
+			supplier_partner_id,
+			category_short_description,
+			product_description,
+			unit_price,
+			currency,
+			weight_measure,
+			unit
+		)
+		SELECT * FROM source
+		ON CONFLICT (product_id) DO UPDATE SET
+			supplier_partner_id = EXCLUDED.supplier_partner_id,
+			category_short_description = EXCLUDED.category_short_description,
+			product_description = EXCLUDED.product_description,
+			unit_price = EXCLUDED.unit_price,
+			currency = EXCLUDED.currency,
+			weight_measure = EXCLUDED.weight_measure,
+			unit = EXCLUDED.unit
+		WHERE
+			(tgt.supplier_partner_id, tgt.category_short_description, tgt.product_description,
+			 tgt.unit_price, tgt.currency, tgt.weight_measure, tgt.unit)
+			IS DISTINCT FROM
+			(EXCLUDED.supplier_partner_id, EXCLUDED.category_short_description, EXCLUDED.product_description,
+			 EXCLUDED.unit_price, EXCLUDED.currency, EXCLUDED.weight_measure, EXCLUDED.unit)
+		RETURNING 1
+	),
+	deleted AS (
+		DELETE FROM silver.dim_products AS tgt
+		-- A changed product can also leave the join (e.g. moved to a category without text)
+		WHERE (v_full OR tgt.product_id = ANY(v_keys))
+		AND NOT EXISTS (SELECT 1 FROM source WHERE source.product_id = tgt.product_id)
+		RETURNING 1
+	)
+	SELECT (SELECT count(*) FROM upserted), (SELECT count(*) FROM deleted)
+	INTO v_upserted, v_deleted;
 
-	INSERT INTO silver.dim_products (
-        product_id,
-        supplier_partner_id,
-        category_short_description,
-        product_description,
-        unit_price,
-        currency,
-        weight_measure,
-        unit
-    )
-	SELECT
-		prd.product_id,
-		prd.supplier_partner_id,
-		prd_cat.category_short_description,
-		prd_txt.product_description,
-		prd.unit_price,
-		prd.currency,
-		prd.weight_measure,
-		prd.unit
-	FROM
-		bronze.products as prd
-	INNER JOIN
-		bronze.product_category_text AS prd_cat
-	ON
-		prd_cat.product_category_id = prd.product_category_id
-	INNER JOIN
-		bronze.product_texts AS prd_txt
-	ON
-		prd_txt.product_id = prd.product_id;
+	CALL silver.record_build('dim_products', v_loads, v_upserted, v_deleted);
 END;
 $$;
@@ -1,35 +1,224 @@
 -- Active: 1753915504673@@127.0.0.1@5434@bike_sales_dw
 -- Fact_sales_orders
-CREATE OR REPLACE TABLE silver.fact_sales_orders AS
-SELECT
-	soi.id_sale_line,
-	soi.sales_order_id,
-	soi.sales_order_item,
-	UPPER(so.life_cycle_status) AS life_cycle_status,
-	UPPER(so.billing_status) AS billing_status,
-	UPPER(so.delivery_status) AS delivery_status,
-	soi.product_id,
-	so.partner_id,
-	so.created_by_id,
-	DATE(so.dt_created_at) AS dt_created_at,
-	DATE(soi.dt_delivery) AS dt_delivery,
-	so.fiscal_month,
-	so.fiscal_year,
-	soi.qty,
-	ROUND(soi.unit_gross_price, 2) AS unit_gross_price,
-	ROUND(soi.gross_price, 2) AS total_gross_price,
-	ROUND(soi.unit_tax_price, 2) AS unit_tax_price,
-	ROUND(soi.tax_price, 2) AS total_tax_price,
-	ROUND(soi.unit_net_price, 2) AS unit_net_price,
-	ROUND(soi.net_price, 2) AS total_net_price,
-	UPPER(soi.currency) AS currency
-FROM
-	bronze.sales_order_items AS soi
-INNER JOIN
-	bronze.sales_orders AS so
-	ON so.sales_order_id = soi.sales_order_id
-WHERE 
-	soi.sales_order_id IS NOT NULL
-ORDER BY
-	dt_created_at ASC,
-	id_sale_line ASC;
+-- Range-partitioned by month of dt_created_at, so date-range queries and refreshes
+-- only touch the months involved. The partition key is part of the primary key.
+
+-- Earlier, unpartitioned versions of the table are dropped here and rebuilt from
+-- bronze by the next call of the procedure
+DO $$
+BEGIN
+	IF EXISTS (
+		SELECT 1 FROM pg_class
+		WHERE oid = to_regclass('silver.fact_sales_orders') AND relkind = 'r'
+	) THEN
+		DROP TABLE silver.fact_sales_orders;
+		DELETE FROM silver.build_log WHERE target = 'fact_sales_orders';
+	END IF;
+END;
+$$;
+
+CREATE TABLE IF NOT EXISTS silver.fact_sales_orders (
+	id_sale_line TEXT NOT NULL,
+	sales_order_id BIGINT,
+	sales_order_item BIGINT,
+	life_cycle_status TEXT,
+	billing_status TEXT,
+	delivery_status TEXT,
+	product_id TEXT,
+	partner_id BIGINT,
+	created_by_id BIGINT,
+	dt_created_at DATE NOT NULL,
+	dt_delivery DATE,
+	fiscal_month BIGINT,
+	fiscal_year BIGINT,
+	qty BIGINT,
+	unit_gross_price NUMERIC,
+	total_gross_price NUMERIC,
+	unit_tax_price NUMERIC,
+	total_tax_price NUMERIC,
+	unit_net_price NUMERIC,
+	total_net_price NUMERIC,
+	currency TEXT,
+	PRIMARY KEY (id_sale_line, dt_created_at)
+) PARTITION BY RANGE (dt_created_at);
+
+-- Partitions
+-- Creates the missing monthly partitions (silver.fact_sales_orders_yYYYYmMM) covering
+-- p_from to p_to, and returns how many were created
+CREATE OR REPLACE FUNCTION silver.create_fact_sales_orders_partitions(p_from DATE, p_to DATE)
+RETURNS INTEGER
+LANGUAGE plpgsql AS $$
+DECLARE
+	v_month DATE := date_trunc('month', p_from)::date;
+	v_partition TEXT;
+	v_created INTEGER := 0;
+BEGIN
+	WHILE v_month <= p_to LOOP
+		v_partition := format('fact_sales_orders_y%sm%s', to_char(v_month, 'YYYY'), to_char(v_month, 'MM'));
+
+		IF to_regclass(format('silver.%I', v_partition)) IS NULL THEN
+			EXECUTE format(
+				'CREATE TABLE silver.%I PARTITION OF silver.fact_sales_orders FOR VALUES FROM (%L) TO (%L)',
+				v_partition, v_month, (v_month + INTERVAL '1 month')::date
+			);
+			v_created := v_created + 1;
+		END IF;
+
+		v_month := (v_month + INTERVAL '1 month')::date;
+	END LOOP;
+
+	RETURN v_created;
+END;
+$$;
+
+--Procedure
+-- Incremental build: nothing is done unless a source table was loaded since the
+-- last build. After a full snapshot everything is rebuilt and vanished rows are
+-- deleted; after delta loads only the lines they changed, and the lines of the
+-- orders they changed, are rebuilt
+CREATE OR REPLACE PROCEDURE process_fact_sales_orders()
+LANGUAGE plpgsql AS $$
+DECLARE
+	v_sources TEXT[] := ARRAY['sales_orders', 'sales_order_items'];
+	v_loads JSONB := silver.source_loads(v_sources);
+	v_full BOOLEAN;
+	v_keys TEXT[];
+	v_upserted BIGINT;
+	v_deleted BIGINT;
+BEGIN
+	IF silver.is_up_to_date('fact_sales_orders', v_loads) THEN
+		RETURN;
+	END IF;
+
+	v_full := silver.needs_full_build('fact_sales_orders', v_sources);
+
+	IF v_full THEN
+		PERFORM silver.create_fact_sales_orders_partitions(min(dt_created_at)::date, max(dt_created_at)::date)
+		FROM bronze.sales_orders;
+	ELSE
+		v_keys := ARRAY(
+			SELECT unnest(silver.changed_keys('fact_sales_orders', 'sales_order_items'))
+			UNION
+			SELECT soi.id_sale_line
+			FROM bronze.sales_order_items AS soi
+			WHERE soi.sales_order_id = ANY(silver.changed_keys('fact_sales_orders', 'sales_orders')::BIGINT[])
+		);
+
+		PERFORM silver.create_fact_sales_orders_partitions(min(so.dt_created_at)::date, max(so.dt_created_at)::date)
+		FROM bronze.sales_order_items AS soi
+		INNER JOIN bronze.sales_orders AS so
+			ON so.sales_order_id = soi.sales_order_id
+		WHERE soi.id_sale_line = ANY(v_keys);
+	END IF;
+
+	WITH source AS (
+		SELECT
+			soi.id_sale_line,
+			soi.sales_order_id,
+			soi.sales_order_item,
+			UPPER(so.life_cycle_status) AS life_cycle_status,
+			UPPER(so.billing_status) AS billing_status,
+			UPPER(so.delivery_status) AS delivery_status,
+			soi.product_id,
+			so.partner_id,
+			so.created_by_id,
+			DATE(so.dt_created_at) AS dt_created_at,
+			DATE(soi.dt_delivery) AS dt_delivery,
+			so.fiscal_month,
+			so.fiscal_year,
+			soi.qty,
+			ROUND(soi.unit_gross_price::numeric, 2) AS unit_gross_price,
+			ROUND(soi.gross_price::numeric, 2) AS total_gross_price,
+			ROUND(soi.unit_tax_price::numeric, 2) AS unit_tax_price,
+			ROUND(soi.tax_price::numeric, 2) AS total_tax_price,
+			ROUND(soi.unit_net_price::numeric, 2) AS unit_net_price,
+			ROUND(soi.net_price::numeric, 2) AS total_net_price,
+			UPPER(soi.currency) AS currency
+		FROM
+			bronze.sales_order_items AS soi
+		INNER JOIN
+			bronze.sales_orders AS so
+			ON so.sales_order_id = soi.sales_order_id
+		WHERE
+			soi.sales_order_id IS NOT NULL
+			-- Lines without a creation date have no partition
+			AND so.dt_created_at IS NOT NULL
+			AND (v_full OR soi.id_sale_line = ANY(v_keys))
+	),
+	upserted AS (
+		INSERT INTO silver.fact_sales_orders AS tgt (
+			id_sale_line,
+			sales_order_id,
+			sales_order_item,
+			life_cycle_status,
+			billing_status,
+			delivery_status,
+			product_id,
+			partner_id,
+			created_by_id,
+			dt_created_at,
+			dt_delivery,
+			fiscal_month,
+			fiscal_year,
+			qty,
+			unit_gross_price,
+			total_gross_price,
+			unit_tax_price,
+			total_tax_price,
+			unit_net_price,
+			total_net_price,
+			currency
+		)
+		SELECT * FROM source
+		ON CONFLICT (id_sale_line, dt_created_at) DO UPDATE SET
+			sales_order_id = EXCLUDED.sales_order_id,
+			sales_order_item = EXCLUDED.sales_order_item,
+			life_cycle_status = EXCLUDED.life_cycle_status,
+			billing_status = EXCLUDED.billing_status,
+			delivery_status = EXCLUDED.delivery_status,
+			product_id = EXCLUDED.product_id,
+			partner_id = EXCLUDED.partner_id,
+			created_by_id = EXCLUDED.created_by_id,
+			dt_delivery = EXCLUDED.dt_delivery,
+			fiscal_month = EXCLUDED.fiscal_month,
+			fiscal_year = EXCLUDED.fiscal_year,
+			qty = EXCLUDED.qty,
+			unit_gross_price = EXCLUDED.unit_gross_price,
+			total_gross_price = EXCLUDED.total_gross_price,
+			unit_tax_price = EXCLUDED.unit_tax_price,
+			total_tax_price = EXCLUDED.total_tax_price,
+			unit_net_price = EXCLUDED.unit_net_price,
+			total_net_price = EXCLUDED.total_net_price,
+			currency = EXCLUDED.currency
+		WHERE
+			(tgt.sales_order_id, tgt.sales_order_item, tgt.life_cycle_status, tgt.billing_status,
+			 tgt.delivery_status, tgt.product_id, tgt.partner_id, tgt.created_by_id,
+			 tgt.dt_delivery, tgt.fiscal_month, tgt.fiscal_year, tgt.qty,
+			 tgt.unit_gross_price, tgt.total_gross_price, tgt.unit_tax_price, tgt.total_tax_price,
+			 tgt.unit_net_price, tgt.total_net_price, tgt.currency)
+			IS DISTINCT FROM
+			(EXCLUDED.sales_order_id, EXCLUDED.sales_order_item, EXCLUDED.life_cycle_status,
+			 EXCLUDED.billing_status, EXCLUDED.delivery_status, EXCLUDED.product_id,
+			 EXCLUDED.partner_id, EXCLUDED.created_by_id,
+			 EXCLUDED.dt_delivery, EXCLUDED.fiscal_month, EXCLUDED.fiscal_year, EXCLUDED.qty,
+			 EXCLUDED.unit_gross_price, EXCLUDED.total_gross_price, EXCLUDED.unit_tax_price,
+			 EXCLUDED.total_tax_price, EXCLUDED.unit_net_price, EXCLUDED.total_net_price,
+			 EXCLUDED.currency)
+		RETURNING 1
+	),
+	deleted AS (
+		DELETE FROM silver.fact_sales_orders AS tgt
+		-- A changed line can also leave the join, or move to another month
+		WHERE (v_full OR tgt.id_sale_line = ANY(v_keys))
+		AND NOT EXISTS (
+			SELECT 1 FROM source
+			WHERE source.id_sale_line = tgt.id_sale_line AND source.dt_created_at = tgt.dt_created_at
+		)
+		RETURNING 1
+	)
+	SELECT (SELECT count(*) FROM upserted), (SELECT count(*) FROM deleted)
+	INTO v_upserted, v_deleted;
+
+	CALL silver.record_build('fact_sales_orders', v_loads, v_upserted, v_deleted);
+END;
+$$;
@@ -0,0 +1,569 @@
+import hashlib
+import os
+from io import BytesIO
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional, Sequence, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+
+# Serialization format of the objects written to the staging bucket ('parquet' or 'csv')
+STAGING_FORMAT = os.getenv('STAGING_FORMAT', 'parquet')
+PARQUET_COMPRESSION = os.getenv('PARQUET_COMPRESSION', 'zstd')
+
+# Rows per batch (Parquet) and bytes per block (CSV) when a staging object is read in batches
+STAGING_BATCH_SIZE = int(os.getenv('STAGING_BATCH_SIZE', '100000'))
+CSV_BLOCK_SIZE = int(os.getenv('CSV_BLOCK_SIZE', str(16 * 1024 * 1024)))
+
+# Size of each multipart upload part (S3 requires at least 5 MiB for all parts but the last)
+MULTIPART_PART_SIZE = int(os.getenv('MULTIPART_PART_SIZE', str(8 * 1024 * 1024)))
+
+# Arrow type of each staging dtype, used to parse CSV objects, and the pandas dtype
+# Arrow columns are converted back to (floats and timestamps keep their NumPy dtype)
+ARROW_TYPES = {
+    'Int64': pa.int64(),
+    'string': pa.string(),
+    'float64': pa.float64()
+}
+PANDAS_TYPES = {
+    pa.int64(): pd.Int64Dtype(),
+    pa.string(): pd.StringDtype()
+}
+
+# User metadata key holding the SHA-256 of a staging object's content
+CONTENT_HASH_METADATA = 'content-sha256'
+
+# User metadata key holding the latest change date (YYYYMMDD) of an incremental extract
+CHANGED_THROUGH_METADATA = 'changed-through'
+
+# Parquet files start (and end) with these magic bytes
+PARQUET_MAGIC = b'PAR1'
+
+# Typed schema of the raw API columns for each endpoint, stored as-is in Parquet
+STAGING_SCHEMAS = {
+    'addresses': {
+        'ADDRESS_ID': 'Int64',
+        'CITY': 'string',
+        'POSTALCODE': 'string',
+        'STREET': 'string',
+        'BUILDING': 'float64',
+        'COUNTRY': 'string',
+        'REGION': 'string',
+        'ADDRESSTYPE': 'Int64',
+        'VALIDITY_STARTDATE': 'Int64',
+        'VALIDITY_ENDDATE': 'Int64',
+        'LATITUDE': 'float64',
+        'LONGITUDE': 'float64'
+    },
+    'business_partners': {
+        'PARTNERID': 'Int64',
+        'PARTNERROLE': 'Int64',
+        'EMAILADDRESS': 'string',
+        'PHONENUMBER': 'Int64',
+        'FAXNUMBER': 'float64',
+        'WEBADDRESS': 'string',
+        'ADDRESSID': 'Int64',
+        'COMPANYNAME': 'string',
+        'LEGALFORM': 'string',
+        'CREATEDBY': 'Int64',
+        'CREATEDAT': 'Int64',
+        'CHANGEDBY': 'Int64',
+        'CHANGEDAT': 'Int64',
+        'CURRENCY': 'string'
+    },
+    'employees': {
+        'EMPLOYEEID': 'Int64',
+        'NAME_FIRST': 'string',
+        'NAME_MIDDLE': 'string',
+        'NAME_LAST': 'string',
+        'NAME_INITIALS': 'float64',
+        'SEX': 'string',
+        'LANGUAGE': 'string',
+        'PHONENUMBER': 'string',
+        'EMAILADDRESS': 'string',
+        'LOGINNAME': 'string',
+        'ADDRESSID': 'Int64',
+        'VALIDITY_STARTDATE': 'Int64',
+        'VALIDITY_ENDDATE': 'Int64',
+        'Unnamed: 13': 'float64',
+        'Unnamed: 14': 'float64',
+        'Unnamed: 15': 'float64',
+        'Unnamed: 16': 'float64',
+        'Unnamed: 17': 'float64',
+        'Unnamed: 18': 'float64'
+    },
+    'product_categories': {
+        'PRODCATEGORYID': 'string',
+        'CREATEDBY': 'Int64',
+        'CREATEDAT': 'Int64'
+    },
+    'product_category_text': {
+        'PRODCATEGORYID': 'string',
+        'LANGUAGE': 'string',
+        'SHORT_DESCR': 'string',
+        'MEDIUM_DESCR': 'float64',
+        'LONG_DESCR': 'float64'
+    },
+    'product_texts': {
+        'PRODUCTID': 'string',
+        'LANGUAGE': 'string',
+        'SHORT_DESCR': 'string',
+        'MEDIUM_DESCR': 'string',
+        'LONG_DESCR': 'float64'
+    },
+    'products': {
+        'PRODUCTID': 'string',
+        'TYPECODE': 'string',
+        'PRODCATEGORYID': 'string',
+        'CREATEDBY': 'Int64',
+        'CREATEDAT': 'Int64',
+        'CHANGEDBY': 'Int64',
+        'CHANGEDAT': 'Int64',
+        'SUPPLIER_PARTNERID': 'Int64',
+        'TAXTARIFFCODE': 'Int64',
+        'QUANTITYUNIT': 'string',
+        'WEIGHTMEASURE': 'float64',
+        'WEIGHTUNIT': 'string',
+        'CURRENCY': 'string',
+        'PRICE': 'Int64',
+        'WIDTH': 'float64',
+        'DEPTH': 'float64',
+        'HEIGHT': 'float64',
+        'DIMENSIONUNIT': 'float64',
+        'PRODUCTPICURL': 'float64'
+    },
+    'sales_order_items': {
+        'SALESORDERID': 'Int64',
+        'SALESORDERITEM': 'Int64',
+        'PRODUCTID': 'string',
+        'NOTEID': 'string',
+        'CURRENCY': 'string',
+        'GROSSAMOUNT': 'Int64',
+        'NETAMOUNT': 'float64',
+        'TAXAMOUNT': 'float64',
+        'ITEMATPSTATUS': 'string',
+        'OPITEMPOS': 'float64',
+        'QUANTITY': 'Int64',
+        'QUANTITYUNIT': 'string',
+        'DELIVERYDATE': 'Int64'
+    },
+    'sales_orders': {
+        'SALESORDERID': 'Int64',
+        'CREATEDBY': 'Int64',
+        'CREATEDAT': 'Int64',
+        'CHANGEDBY': 'Int64',
+        'CHANGEDAT': 'Int64',
+        'FISCVARIANT': 'string',
+        'FISCALYEARPERIOD': 'Int64',
+        'NOTEID': 'float64',
+        'PARTNERID': 'Int64',
+        'SALESORG': 'string',
+        'CURRENCY': 'string',
+        'GROSSAMOUNT': 'Int64',
+        'NETAMOUNT': 'float64',
+        'TAXAMOUNT': 'float64',
+        'LIFECYCLESTATUS': 'string',
+        'BILLINGSTATUS': 'string',
+        'DELIVERYSTATUS': 'string'
+    }
+}
+
+
+def apply_staging_schema(df: pd.DataFrame, endpoint: str) -> pd.DataFrame:
+    """
+    Casts the raw columns of an endpoint DataFrame to their staging types.
+
+    Columns missing from the schema are left untouched, so new API columns
+    do not break the extraction.
+
+    Args:
+        df (pd.DataFrame): Raw data extracted from the API.
+        endpoint (str): The API endpoint the data comes from.
+
+    Returns:
+        pd.DataFrame: The DataFrame with typed columns.
+    """
+    schema = STAGING_SCHEMAS.get(endpoint, {})
+    dtypes = {col: dtype for col, dtype in schema.items() if col in df.columns}
+    return df.astype(dtypes)
+
+
+def serialize_df(df: pd.DataFrame, fmt: str = STAGING_FORMAT) -> bytes:
+    """
+    Serializes a DataFrame in the staging format.
+
+    Args:
+        df (pd.DataFrame): Data to be serialized.
+        fmt (str): 'parquet' (compressed, typed) or 'csv'.
+
+    Returns:
+        bytes: The serialized content.
+    """
+    buffer = BytesIO()
+
+    if fmt == 'parquet':
+        df.to_parquet(buffer, index=False, compression=PARQUET_COMPRESSION)
+    elif fmt == 'csv':
+        df.to_csv(buffer, index=False)
+    else:
+        raise ValueError(f'Unsupported staging format: {fmt}')
+
+    return buffer.getvalue()
+
+
+def read_staging_table(
+    raw_data: BinaryIO,
+    columns: Optional[Iterable[str]] = None,
+    dtypes: Optional[Dict[str, str]] = None
+) -> pa.Table:
+    """
+    Reads a staging object into an Arrow table, whatever its format.
+
+    Parquet objects are recognized by their magic bytes; anything else is
+    parsed as CSV, typed with `dtypes`.
+
+    Args:
+        raw_data (BinaryIO): Content of the staging object.
+        columns (Iterable[str]): Names of the columns to read, case-insensitive.
+            Other columns are skipped by the reader. All columns if not given.
+        dtypes (Dict[str, str]): Staging dtype of the CSV columns (see STAGING_SCHEMAS).
+
+    Returns:
+        pa.Table: The raw endpoint data.
+    """
+    wanted = {col.lower() for col in columns} if columns is not None else None
+
+    position = raw_data.tell()
+    magic = raw_data.read(len(PARQUET_MAGIC))
+    raw_data.seek(position)
+
+    if magic == PARQUET_MAGIC:
+        names = pq.read_schema(raw_data).names
+        raw_data.seek(position)
+        selected = [name for name in names if wanted is None or name.lower() in wanted]
+        return pq.read_table(raw_data, columns=selected).replace_schema_metadata()
+
+    column_types = {col: ARROW_TYPES[dtype] for col, dtype in (dtypes or {}).items()}
+    include_columns = None
+
+    if wanted is not None:
+        names = pd.read_csv(raw_data, nrows=0).columns
+        raw_data.seek(position)
+        include_columns = [name for name in names if name.lower() in wanted]
+
+    return pa_csv.read_csv(
+        raw_data,
+        convert_options=pa_csv.ConvertOptions(
+            column_types=column_types,
+            include_columns=include_columns,
+            strings_can_be_null=True
+        )
+    )
+
+
+def parse_date_column(column: pa.ChunkedArray, null_dates: Sequence[str] = ()) -> pa.ChunkedArray:
+    """
+    Parses a column of %Y%m%d dates (numbers or strings) into timestamps.
+
+    Args:
+        column (pa.ChunkedArray): The raw column.
+        null_dates (Sequence[str]): Values meaning "no date", parsed as null.
+
+    Returns:
+        pa.ChunkedArray: The parsed timestamp[ns] column.
+    """
+    strings = pc.cast(column, pa.string())
+
+    if null_dates:
+        strings = pc.if_else(pc.is_in(strings, value_set=pa.array(null_dates)), None, strings)
+
+    return pc.strptime(strings, format='%Y%m%d', unit='s').cast(pa.timestamp('ns'))
+
+
+def table_to_dataframe(
+    table: pa.Table,
+    dates: Iterable[str] = (),
+    null_dates: Sequence[str] = (),
+    categories: Iterable[str] = ()
+) -> pd.DataFrame:
+    """
+    Converts raw staging data to pandas, parsing dates and encoding categoricals in Arrow.
+
+    Args:
+        table (pa.Table): Raw staging data.
+        dates (Iterable[str]): Columns holding %Y%m%d dates, read as datetime64[ns].
+        null_dates (Sequence[str]): Date values meaning "no date", read as NaT.
+        categories (Iterable[str]): Low-cardinality columns, read as categoricals.
+
+    Returns:
+        pd.DataFrame: The converted data.
+    """
+    dates = {col.lower() for col in dates}
+    categories = {col.lower() for col in categories}
+
+    for i, name in enumerate(table.column_names):
+        if name.lower() in dates:
+            table = table.set_column(i, name, parse_date_column(table.column(i), null_dates))
+        elif name.lower() in categories:
+            table = table.set_column(i, name, pc.dictionary_encode(table.column(i)))
+
+    return table.to_pandas(types_mapper=PANDAS_TYPES.get)
+
+
+def read_staging_data(
+    raw_data: Union[BinaryIO, bytes],
+    columns: Optional[Iterable[str]] = None,
+    dtypes: Optional[Dict[str, str]] = None,
+    dates: Iterable[str] = (),
+    null_dates: Sequence[str] = (),
+    categories: Iterable[str] = ()
+) -> pd.DataFrame:
+    """
+    Reads a staging object into a DataFrame, whatever its format.
+
+    Column pruning, %Y%m%d date parsing and dictionary encoding all happen in Arrow,
+    before the data reaches pandas, so skipped columns are never materialized.
+
+    Args:
+        raw_data (BinaryIO | bytes): Content of the staging object.
+        columns (Iterable[str]): Names of the columns to read, case-insensitive.
+            All columns if not given.
+        dtypes (Dict[str, str]): Staging dtype of the CSV columns (see STAGING_SCHEMAS).
+        dates (Iterable[str]): Columns holding %Y%m%d dates, read as datetime64[ns].
+        null_dates (Sequence[str]): Date values meaning "no date", read as NaT.
+        categories (Iterable[str]): Low-cardinality columns, read as categoricals.
+
+    Returns:
+        pd.DataFrame: The raw endpoint data.
+    """
+    if isinstance(raw_data, bytes):
+        raw_data = BytesIO(raw_data)
+
+    table = read_staging_table(raw_data, columns, dtypes)
+
+    return table_to_dataframe(table, dates, null_dates, categories)
+
+
+def iter_staging_batches(
+    source: BinaryIO,
+    columns: Optional[Iterable[str]] = None,
+    dtypes: Optional[Dict[str, str]] = None,
+    batch_size: int = STAGING_BATCH_SIZE
+) -> Iterator[pa.Table]:
+    """
+    Reads a staging object batch by batch, whatever its format.
+
+    Parquet objects are read row group by row group and CSV objects block by block,
+    so only one batch is held in memory at a time. At least one (possibly empty)
+    batch is yielded, carrying the schema.
+
+    Args:
+        source (BinaryIO): Seekable staging object.
+        columns (Iterable[str]): Names of the columns to read, case-insensitive.
+            All columns if not given.
+        dtypes (Dict[str, str]): Staging dtype of the CSV columns (see STAGING_SCHEMAS).
+        batch_size (int): Maximum number of rows of each Parquet batch (CSV batches
+            are sized by their block of bytes).
+
+    Yields:
+        pa.Table: The raw endpoint data, one batch at a time.
+    """
+    wanted = {col.lower() for col in columns} if columns is not None else None
+
+    position = source.tell()
+    magic = source.read(len(PARQUET_MAGIC))
+    source.seek(position)
+
+    if magic == PARQUET_MAGIC:
+        parquet_file = pq.ParquetFile(source)
+        names = parquet_file.schema_arrow.names
+        selected = [name for name in names if wanted is None or name.lower() in wanted]
+        schema = pa.schema([parquet_file.schema_arrow.field(name) for name in selected])
+        batches = parquet_file.iter_batches(batch_size=batch_size, columns=selected)
+    else:
+        include_columns = None
+        if wanted is not None:
+            names = pd.read_csv(source, nrows=0).columns
+            source.seek(position)
+            include_columns = [name for name in names if name.lower() in wanted]
+
+        reader = pa_csv.open_csv(
+            source,
+            read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={col: ARROW_TYPES[dtype] for col, dtype in (dtypes or {}).items()},
+                include_columns=include_columns,
+                strings_can_be_null=True
+            )
+        )
+        schema = reader.schema
+        batches = reader
+
+    # The pandas metadata of Parquet files describes the raw dtypes, not the converted ones
+    schema = schema.remove_metadata()
+
+    empty = True
+    for batch in batches:
+        empty = False
+        yield pa.Table.from_batches([batch]).replace_schema_metadata()
+
+    if empty:
+        yield schema.empty_table()
+
+
+class MultipartUploadWriter:
+    """
+    Write-only file object that streams its content to an S3/MinIO object.
+
+    Written bytes are buffered and sent as multipart upload parts of
+    `part_size` bytes, so at most one part is held in memory. Objects smaller
+    than one part are sent with a single `put_object` on close.
+
+    The SHA-256 of the content is computed on the fly and stored as the
+    `content-sha256` user metadata of the object, so consumers can tell whether
+    two objects hold the same data without downloading them. Entries added to
+    `metadata` before the writer is closed are stored with it.
+    """
+
+    def __init__(self, s3, bucket: str, key: str, part_size: int = MULTIPART_PART_SIZE, metadata: Optional[dict] = None):
+        self.s3 = s3
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.buffer = bytearray()
+        self.parts = []
+        self.upload_id: Optional[str] = None
+        self.position = 0
+        self.hash = hashlib.sha256()
+        self.metadata = dict(metadata or {})
+        self.closed = False
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    @property
+    def content_hash(self) -> str:
+        return self.hash.hexdigest()
+
+    def write(self, data: bytes) -> int:
+        self.buffer.extend(data)
+        self.hash.update(data)
+        self.position += len(data)
+
+        while len(self.buffer) >= self.part_size:
+            self._upload_part(bytes(self.buffer[:self.part_size]))
+            del self.buffer[:self.part_size]
+
+        return len(data)
+
+    def _upload_part(self, body: bytes) -> None:
+        if self.upload_id is None:
+            response = self.s3.create_multipart_upload(Bucket=self.bucket, Key=self.key)
+            self.upload_id = response['UploadId']
+
+        part_number = len(self.parts) + 1
+        response = self.s3.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=body
+        )
+        self.parts.append({'ETag': response['ETag'], 'PartNumber': part_number})
+
+    def close(self) -> None:
+        """
+        Uploads the remaining bytes and completes the upload.
+        """
+        if self.closed:
+            return
+
+        metadata = {**self.metadata, CONTENT_HASH_METADATA: self.content_hash}
+
+        if self.upload_id is None:
+            self.s3.put_object(Bucket=self.bucket, Key=self.key, Body=bytes(self.buffer), Metadata=metadata)
+        else:
+            if self.buffer:
+                self._upload_part(bytes(self.buffer))
+            self.s3.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self.upload_id,
+                MultipartUpload={'Parts': self.parts}
+            )
+            # The hash is only known now, so it is set with a server-side copy onto itself
+            self.s3.copy_object(
+                Bucket=self.bucket,
+                Key=self.key,
+                CopySource={'Bucket': self.bucket, 'Key': self.key},
+                Metadata=metadata,
+                MetadataDirective='REPLACE'
+            )
+
+        self.buffer = bytearray()
+        self.closed = True
+
+    def abort(self) -> None:
+        """
+        Discards the upload, so no partial object is left in the bucket.
+        """
+        if self.upload_id is not None and not self.closed:
+            self.s3.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+
+        self.buffer = bytearray()
+        self.closed = True
+
+
+class StagingWriter:
+    """
+    Serializes DataFrame chunks into a single staging file on a writable sink.
+
+    Parquet chunks become row groups of one file (the schema is fixed by the
+    first chunk); CSV chunks are appended with the header written once.
+    """
+
+    def __init__(self, sink, fmt: str = STAGING_FORMAT):
+        if fmt not in ('parquet', 'csv'):
+            raise ValueError(f'Unsupported staging format: {fmt}')
+
+        self.sink = sink
+        self.fmt = fmt
+        self.parquet_writer: Optional[pq.ParquetWriter] = None
+        self.header_written = False
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.fmt == 'parquet':
+            if self.parquet_writer is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                self.parquet_writer = pq.ParquetWriter(self.sink, table.schema, compression=PARQUET_COMPRESSION)
+            else:
+                table = pa.Table.from_pandas(df, schema=self.parquet_writer.schema, preserve_index=False)
+
+            self.parquet_writer.write_table(table)
+        else:
+            self.sink.write(df.to_csv(index=False, header=not self.header_written).encode())
+            self.header_written = True
+
+    def close(self) -> None:
+        """
+        Finalizes the file (Parquet footer) and closes the sink.
+        """
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
+        self.sink.close()
+
+    def abort(self) -> None:
+        """
+        Abandons the file without finalizing it.
+        """
+        if hasattr(self.sink, 'abort'):
+            self.sink.abort()
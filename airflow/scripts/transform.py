@@ -1,8 +1,15 @@
 from minio import Minio
-from datetime import datetime
+from minio.error import S3Error
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
 import pandas as pd
-from io import BytesIO
+import json
+from io import BufferedReader, BytesIO, RawIOBase
 import logging
+import multiprocessing
+import os
+import time
+from typing import Optional
 
 from transformers import (
     addresses,
@@ -16,7 +23,11 @@ from transformers import (
     sales_orders
 )
 
-from load import upload_dataframe_to_postgres
+from transformers.engine import iter_spec
+
+from staging import CHANGED_THROUGH_METADATA, CONTENT_HASH_METADATA
+
+from load import get_last_loads, record_load, record_watermark, transaction, upload_chunks_to_postgres, upload_dataframe_to_postgres
 
 # =============================
 # Logging configuration
@@ -29,6 +40,72 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# =============================
+# Pipeline configuration
+# =============================
+MINIO_CONFIG = {
+    'host': os.getenv('MINIO_HOST', 'minio:9000'),
+    'access_key': os.getenv('MINIO_ROOT_USER', 'minioadmin'),
+    'secret_key': os.getenv('MINIO_ROOT_PASSWORD', 'minioadmin'),
+    'bucket': 'staging'
+}
+
+# Transform function of each endpoint
+TRANSFORMERS = {
+    'addresses': addresses.transform,
+    'business_partners': business_partners.transform,
+    'employees': employees.transform,
+    'product_categories': product_categories.transform,
+    'product_category_text': product_category_text.transform,
+    'product_texts': product_texts.transform,
+    'products': products.transform,
+    'sales_order_items': sales_order_items.transform,
+    'sales_orders': sales_orders.transform,
+}
+
+# Spec of each endpoint, used to transform large objects chunk by chunk
+TRANSFORM_SPECS = {
+    'addresses': addresses.SPEC,
+    'business_partners': business_partners.SPEC,
+    'employees': employees.SPEC,
+    'product_categories': product_categories.SPEC,
+    'product_category_text': product_category_text.SPEC,
+    'product_texts': product_texts.SPEC,
+    'products': products.SPEC,
+    'sales_order_items': sales_order_items.SPEC,
+    'sales_orders': sales_orders.SPEC,
+}
+
+# Objects of at least this size (bytes) are streamed: read with ranged requests, transformed
+# and loaded chunk by chunk, so memory does not grow with the table (TRANSFORM_STREAMING=always|never|auto)
+TRANSFORM_STREAMING = os.getenv('TRANSFORM_STREAMING', 'auto')
+TRANSFORM_STREAMING_THRESHOLD = int(os.getenv('TRANSFORM_STREAMING_THRESHOLD', str(64 * 1024 * 1024)))
+TRANSFORM_READ_BUFFER = int(os.getenv('TRANSFORM_READ_BUFFER', str(8 * 1024 * 1024)))
+
+# Skip transform and load when the latest object has the content hash of the last loaded one
+TRANSFORM_SKIP_UNCHANGED = os.getenv('TRANSFORM_SKIP_UNCHANGED', 'true').lower() == 'true'
+
+# Concurrency of each stage: MinIO downloads and Postgres loads are I/O bound (threads),
+# pandas transforms are CPU bound (processes, or threads with TRANSFORM_EXECUTOR=thread)
+DOWNLOAD_MAX_WORKERS = int(os.getenv('DOWNLOAD_MAX_WORKERS', '4'))
+TRANSFORM_MAX_WORKERS = int(os.getenv('TRANSFORM_MAX_WORKERS', str(min(4, os.cpu_count() or 1))))
+TRANSFORM_EXECUTOR = os.getenv('TRANSFORM_EXECUTOR', 'process')
+LOAD_MAX_WORKERS = int(os.getenv('LOAD_MAX_WORKERS', '3'))
+
+# Business key of each bronze table, used to merge delta extracts
+BUSINESS_KEYS = {
+    'addresses': 'address_id',
+    'business_partners': 'partner_id',
+    'employees': 'employee_id',
+    'product_categories': 'product_category_id',
+    'product_category_text': 'product_category_id',
+    'product_texts': 'product_id',
+    'products': 'product_id',
+    'sales_order_items': 'id_sale_line',
+    'sales_orders': 'sales_order_id',
+}
+
+
 # =============================
 # MinIO Connection
 # =============================
@@ -59,6 +136,10 @@ def get_latest_object_name_for_endpoint(client: Minio, bucket_name: str, endpoin
     """
     Retrieves the most recent object name for a given endpoint in the MinIO bucket.
 
+    Only the current month is listed, then the previous one if the current month
+    has no object yet (first run after a month change), so the listing stays
+    bounded however much history the bucket keeps.
+
     Args:
         client (Minio): MinIO client instance.
         bucket_name (str): Name of the bucket.
@@ -68,15 +149,184 @@ def get_latest_object_name_for_endpoint(client: Minio, bucket_name: str, endpoin
         str: Object name of the most recent file.
     """
     today = datetime.now()
-    prefix = f'{endpoint}/{today.year}/{today.month:02}/{endpoint}_'
+    previous = today.replace(day=1) - timedelta(days=1)
+
+    for month in (today, previous):
+        prefix = f'{endpoint}/{month.year}/{month.month:02}/{endpoint}_'
+        objects = list(client.list_objects(bucket_name, prefix=prefix, recursive=True))
+
+        if objects:
+            return max(objects, key=lambda obj: obj.object_name).object_name
+
+    raise FileNotFoundError(f"No objects found for endpoint '{endpoint}' in bucket '{bucket_name}' since {previous:%Y/%m}")
+
+
+def read_latest_pointer(client: Minio, bucket_name: str, endpoint: str) -> Optional[dict]:
+    """
+    Reads the `{endpoint}/_latest.json` pointer written by the extractor.
+
+    Args:
+        client (Minio): MinIO client instance.
+        bucket_name (str): Name of the bucket.
+        endpoint (str): Data endpoint prefix.
+
+    Returns:
+        dict | None: Latest object name, size and content hash, or None if the
+            endpoint has no pointer yet.
+    """
+    try:
+        response = client.get_object(bucket_name, f'{endpoint}/_latest.json')
+    except S3Error as e:
+        if e.code == 'NoSuchKey':
+            return None
+        raise
+
+    try:
+        return json.loads(response.read())
+    finally:
+        response.close()
+        response.release_conn()
+
+
+def resolve_latest_object(client: Minio, bucket_name: str, endpoint: str) -> dict:
+    """
+    Finds the latest staging object of an endpoint with its size and content hash.
+
+    The extractor's pointer answers with a single GET. Endpoints without a
+    pointer (objects written before it existed, or a pointer that was removed)
+    fall back to listing the bucket and reading the object metadata.
+
+    Args:
+        client (Minio): MinIO client instance.
+        bucket_name (str): Name of the bucket.
+        endpoint (str): Data endpoint prefix.
+
+    Returns:
+        dict: `object_name`, `size`, `content_hash` and `changed_through` (None if
+            unknown) of the object.
+    """
+    pointer = read_latest_pointer(client, bucket_name, endpoint)
+
+    if pointer is not None:
+        return {key: pointer.get(key) for key in ('object_name', 'size', 'content_hash', 'changed_through')}
+
+    logger.info(f'No latest-object pointer for {endpoint}, listing the bucket.')
+    object_name = get_latest_object_name_for_endpoint(client, bucket_name, endpoint)
+
+    return describe_object(client, bucket_name, object_name)
+
+
+def describe_object(client: Minio, bucket_name: str, object_name: str) -> dict:
+    """
+    Reads the size and the metadata of a staging object.
+
+    Args:
+        client (Minio): MinIO client instance.
+        bucket_name (str): Name of the bucket.
+        object_name (str): Object name.
+
+    Returns:
+        dict: `object_name`, `size`, `content_hash` and `changed_through` (None if
+            unknown) of the object.
+    """
+    stat = client.stat_object(bucket_name, object_name)
+
+    return {
+        'object_name': object_name,
+        'size': stat.size,
+        'content_hash': get_content_hash(stat),
+        'changed_through': get_changed_through(stat)
+    }
+
 
-    objects = list(client.list_objects(bucket_name, prefix=prefix, recursive=True))
+def list_pending_objects(client: Minio, bucket_name: str, endpoint: str, latest: dict, last_loaded: Optional[str]) -> list[dict]:
+    """
+    Lists the staging objects of an endpoint still to be loaded, oldest first.
+
+    A full snapshot replaces the table, so when the latest object is one, it is the
+    only object to load. Deltas are only merged, so when the latest object is a
+    delta, every object extracted since the last one loaded is returned, starting
+    from the most recent full snapshot among them: each delta is then applied once,
+    in extraction order, even if an earlier run failed before loading it.
+
+    Object names embed the extraction timestamp, so name order is chronological.
+
+    Args:
+        client (Minio): MinIO client instance.
+        bucket_name (str): Name of the bucket.
+        endpoint (str): Data endpoint prefix.
+        latest (dict): The latest object, see `resolve_latest_object`.
+        last_loaded (str, optional): Object name of the last load of the endpoint.
+
+    Returns:
+        list[dict]: The objects to load, see `describe_object`; the latest one last.
+    """
+    latest_name = latest['object_name']
+
+    if not is_delta_object(latest_name) or last_loaded is None or latest_name <= last_loaded:
+        return [latest]
+
+    names = sorted(
+        obj.object_name
+        for obj in client.list_objects(bucket_name, prefix=f'{endpoint}/', recursive=True, start_after=last_loaded)
+        if obj.object_name.rsplit('/', 1)[-1].startswith(f'{endpoint}_') and last_loaded < obj.object_name < latest_name
+    )
+
+    snapshots = [i for i, name in enumerate(names) if not is_delta_object(name)]
+    if snapshots:
+        names = names[snapshots[-1]:]
+
+    return [describe_object(client, bucket_name, name) for name in names] + [latest]
+
+
+def is_delta_object(object_name: str) -> bool:
+    """
+    Tells whether a staging object is an incremental extract (only changed rows).
+
+    Args:
+        object_name (str): Object name in the staging bucket.
+
+    Returns:
+        bool: True for `{endpoint}_{timestamp}_delta.*` objects.
+    """
+    return object_name.rsplit('.', 1)[0].endswith('_delta')
+
+
+def get_content_hash(stat) -> Optional[str]:
+    """
+    Returns the content hash stored in the metadata of a staging object, if any.
+
+    Args:
+        stat: Result of `Minio.stat_object`.
+
+    Returns:
+        str | None: SHA-256 of the object content (None for objects written without it).
+    """
+    return get_user_metadata(stat, CONTENT_HASH_METADATA)
+
+
+def get_changed_through(stat) -> Optional[int]:
+    """
+    Returns the latest change date (YYYYMMDD) stored with an incremental extract, if any.
 
-    if not objects:
-        raise FileNotFoundError(f"No objects found for prefix '{prefix}' in bucket '{bucket_name}'")
+    Args:
+        stat: Result of `Minio.stat_object`.
+
+    Returns:
+        int | None: The change date (None for full extracts outside incremental mode).
+    """
+    value = get_user_metadata(stat, CHANGED_THROUGH_METADATA)
+    return int(value) if value is not None else None
 
-    latest_object = max(objects, key=lambda obj: obj.object_name).object_name
-    return latest_object
+
+def get_user_metadata(stat, key: str) -> Optional[str]:
+    """
+    Returns a user metadata value of a staging object, if set.
+    """
+    for name, value in (stat.metadata or {}).items():
+        if name.lower() == f'x-amz-meta-{key}':
+            return value
+    return None
 
 
 # =============================
@@ -101,50 +351,400 @@ def get_data_from_latest_object(client: Minio, bucket_name: str, object_name: st
     return data
 
 
+class MinioObjectReader(RawIOBase):
+    """
+    Seekable, read-only file over a MinIO object, fetching the requested ranges on demand.
+
+    Parquet readers need random access (the footer holds the metadata), so a plain
+    response stream is not enough. Wrap it in a BufferedReader, see `open_object`.
+    """
+
+    def __init__(self, client: Minio, bucket_name: str, object_name: str, size: int):
+        self.client = client
+        self.bucket_name = bucket_name
+        self.object_name = object_name
+        self.size = size
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence == 0:
+            self.position = offset
+        elif whence == 1:
+            self.position += offset
+        else:
+            self.position = self.size + offset
+        return self.position
+
+    def readinto(self, buffer) -> int:
+        length = min(len(buffer), self.size - self.position)
+        if length <= 0:
+            return 0
+
+        response = self.client.get_object(self.bucket_name, self.object_name, offset=self.position, length=length)
+        try:
+            data = response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
+        buffer[:len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+
+def open_object(client: Minio, bucket_name: str, object_name: str, size: int) -> BufferedReader:
+    """
+    Opens a MinIO object as a buffered, seekable binary file (TRANSFORM_READ_BUFFER bytes per request).
+
+    Args:
+        client (Minio): MinIO client instance.
+        bucket_name (str): Name of the bucket.
+        object_name (str): Object name to read.
+        size (int): Object size in bytes.
+
+    Returns:
+        BufferedReader: The object as a file.
+    """
+    return BufferedReader(MinioObjectReader(client, bucket_name, object_name, size), buffer_size=TRANSFORM_READ_BUFFER)
+
+
+def should_stream(size: int) -> bool:
+    """
+    Tells whether an object of this size is transformed chunk by chunk (see TRANSFORM_STREAMING).
+    """
+    if TRANSFORM_STREAMING == 'always':
+        return True
+    if TRANSFORM_STREAMING == 'never':
+        return False
+    return size >= TRANSFORM_STREAMING_THRESHOLD
+
+
+def stream_object_to_postgres(
+    endpoint: str,
+    client: Minio,
+    bucket_name: str,
+    object_name: str,
+    size: int,
+    content_hash: Optional[str] = None,
+    changed_through: Optional[int] = None
+) -> int:
+    """
+    Transforms a staging object chunk by chunk and loads each chunk as soon as it is ready.
+
+    Full snapshots fill the shadow table chunk by chunk before it is swapped in; delta
+    extracts are merged chunk by chunk. Either way the load, and its record in the
+    control table, is one transaction.
+
+    Args:
+        endpoint (str): Data endpoint (key of TRANSFORM_SPECS).
+        client (Minio): MinIO client instance.
+        bucket_name (str): Name of the staging bucket.
+        object_name (str): Object name to transform.
+        size (int): Object size in bytes.
+        content_hash (str, optional): Content hash of the object.
+        changed_through (int, optional): Latest change date in the object (incremental mode).
+
+    Returns:
+        int: Number of rows loaded.
+    """
+    with open_object(client, bucket_name, object_name, size) as source, transaction() as conn:
+        chunks = iter_spec(TRANSFORM_SPECS[endpoint], source)
+
+        if is_delta_object(object_name):
+            rows = upload_chunks_to_postgres(
+                chunks, endpoint, if_exists='merge', schema='bronze', con=conn, key=BUSINESS_KEYS[endpoint]
+            )
+        else:
+            rows = upload_chunks_to_postgres(chunks, endpoint, if_exists='swap', schema='bronze', con=conn)
+
+        record_load(
+            endpoint, object_name, content_hash, rows,
+            con=conn, delta=is_delta_object(object_name), changed_through=changed_through
+        )
+
+    return rows
+
+
+def write_bronze_table(endpoint: str, df: pd.DataFrame, object_name: str, conn) -> None:
+    """
+    Writes transformed data to its bronze table: full snapshots are swapped in
+    atomically, delta extracts are merged by business key.
+
+    Args:
+        endpoint (str): Data endpoint (bronze table name).
+        df (pd.DataFrame): The transformed data.
+        object_name (str): Staging object the data comes from (tells deltas apart).
+        conn (Connection): Connection of the load transaction.
+    """
+    if is_delta_object(object_name):
+        upload_dataframe_to_postgres(df, endpoint, if_exists='merge', schema='bronze', con=conn, key=BUSINESS_KEYS[endpoint])
+    else:
+        upload_dataframe_to_postgres(df, endpoint, if_exists='swap', schema='bronze', con=conn)
+
+
+def load_dataframe(
+    endpoint: str,
+    df: pd.DataFrame,
+    object_name: str,
+    content_hash: Optional[str],
+    changed_through: Optional[int] = None
+) -> None:
+    """
+    Loads a transformed object into bronze and records it in the control table, in one transaction.
+
+    Args:
+        endpoint (str): Data endpoint (bronze table name).
+        df (pd.DataFrame): The transformed data.
+        object_name (str): Staging object the data comes from.
+        content_hash (str, optional): Content hash of the object.
+        changed_through (int, optional): Latest change date in the object (incremental mode).
+    """
+    with transaction() as conn:
+        write_bronze_table(endpoint, df, object_name, conn)
+        record_load(
+            endpoint, object_name, content_hash, len(df),
+            con=conn, delta=is_delta_object(object_name), changed_through=changed_through
+        )
+
+
 # =============================
 # Transform and Load Pipeline
 # =============================
-def transform_and_load_data_from_all_endpoints():
+def transform_object(endpoint: str, data: bytes) -> pd.DataFrame:
+    """
+    Transforms the raw content of a staging object with the endpoint's transformer.
+
+    Module-level so it can run in a worker process.
+
+    Args:
+        endpoint (str): Data endpoint (key of TRANSFORMERS).
+        data (bytes): Raw content of the staging object.
+
+    Returns:
+        pd.DataFrame: The transformed data.
+    """
+    return TRANSFORMERS[endpoint](BytesIO(data))
+
+
+def create_transform_executor() -> Executor:
+    """
+    Creates the executor running the CPU-bound transforms.
+
+    Worker processes are spawned (not forked), since the pipeline already runs
+    threads when the first transform is submitted.
+    """
+    if TRANSFORM_EXECUTOR == 'process':
+        return ProcessPoolExecutor(
+            max_workers=TRANSFORM_MAX_WORKERS,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+
+    return ThreadPoolExecutor(max_workers=TRANSFORM_MAX_WORKERS)
+
+
+def load_object(
+    endpoint: str,
+    client: Minio,
+    bucket_name: str,
+    staged: dict,
+    download_executor: Executor,
+    transform_executor: Executor,
+    load_executor: Executor
+) -> int:
+    """
+    Transforms and loads one staging object, each stage on its own executor.
+
+    Large objects are streamed chunk by chunk (see `should_stream`), the others are
+    downloaded and transformed whole.
+
+    Args:
+        endpoint (str): Data endpoint (key of TRANSFORMERS).
+        client (Minio): MinIO client instance.
+        bucket_name (str): Name of the staging bucket.
+        staged (dict): The object, see `describe_object`.
+        download_executor (Executor): Bounded pool for MinIO downloads.
+        transform_executor (Executor): Bounded pool for the transforms.
+        load_executor (Executor): Bounded pool for the Postgres loads.
+
+    Returns:
+        int: Number of rows loaded.
+    """
+    object_name, size = staged['object_name'], staged['size']
+    content_hash, changed_through = staged['content_hash'], staged['changed_through']
+
+    if should_stream(size):
+        logger.info(f'Streaming {object_name} ({size} bytes) chunk by chunk')
+        rows = load_executor.submit(
+            stream_object_to_postgres, endpoint, client, bucket_name, object_name, size, content_hash, changed_through
+        ).result()
+        logger.info(f'{endpoint} streamed into Postgres.')
+        return rows
+
+    raw_data = download_executor.submit(get_data_from_latest_object, client, bucket_name, object_name).result()
+    df = transform_executor.submit(transform_object, endpoint, raw_data.getvalue()).result()
+
+    logger.info(f'{endpoint} transformation complete.')
+    logger.info(f'DataFrame shape: {df.shape}')
+
+    load_executor.submit(load_dataframe, endpoint, df, object_name, content_hash, changed_through).result()
+    logger.info(f'{endpoint} {"delta merged" if is_delta_object(object_name) else "uploaded"} into Postgres.')
+    return len(df)
+
+
+def process_endpoint(
+    endpoint: str,
+    client: Minio,
+    bucket_name: str,
+    download_executor: Executor,
+    transform_executor: Executor,
+    load_executor: Executor,
+    last_loads: Optional[dict] = None
+) -> dict:
+    """
+    Runs download, transform and load of the pending objects of one endpoint (see
+    `list_pending_objects`), one after another, each in its own transaction.
+
+    An object is skipped when it has the same content hash as the last object
+    loaded; the endpoint is skipped (status 'skipped') when all of them are, which
+    for a single snapshot only costs reading its pointer.
+
+    Args:
+        endpoint (str): Data endpoint (key of TRANSFORMERS).
+        client (Minio): MinIO client instance.
+        bucket_name (str): Name of the staging bucket.
+        download_executor (Executor): Bounded pool for MinIO downloads.
+        transform_executor (Executor): Bounded pool for the transforms.
+        load_executor (Executor): Bounded pool for the Postgres loads.
+        last_loads (dict, optional): Last object loaded per endpoint, see `get_last_loads`.
+
+    Returns:
+        dict: Result of the endpoint (status, latest object, rows, duration and error, if any).
+    """
+    start = time.perf_counter()
+    result = {'endpoint': endpoint, 'status': 'failed', 'object_name': None, 'rows': None, 'seconds': None, 'error': None}
+    last_load = (last_loads or {}).get(endpoint, {})
+
+    try:
+        logger.info(f'Processing endpoint: {endpoint}')
+        latest = resolve_latest_object(client, bucket_name, endpoint)
+        result['object_name'] = latest['object_name']
+        logger.info(f'Latest object found: {latest["object_name"]}')
+
+        pending = list_pending_objects(client, bucket_name, endpoint, latest, last_load.get('object_name'))
+        if len(pending) > 1:
+            logger.info(f'{len(pending)} objects to load for {endpoint}, from {pending[0]["object_name"]}')
+
+        last_hash = last_load.get('content_hash')
+        rows = None
+
+        for staged in pending:
+            content_hash = staged['content_hash']
+
+            if TRANSFORM_SKIP_UNCHANGED and content_hash and content_hash == last_hash:
+                logger.info(f'{staged["object_name"]} unchanged since the last load ({content_hash[:12]}), skipping.')
+
+                if staged['changed_through'] is not None:
+                    record_watermark(endpoint, content_hash, staged['changed_through'])
+                continue
+
+            rows = (rows or 0) + load_object(
+                endpoint, client, bucket_name, staged, download_executor, transform_executor, load_executor
+            )
+            last_hash = content_hash
+
+        result.update(status='skipped' if rows is None else 'success', rows=rows)
+
+    except Exception as e:
+        logger.error(f'Error processing endpoint "{endpoint}": {e}')
+        result['error'] = str(e)
+
+    result['seconds'] = round(time.perf_counter() - start, 2)
+    return result
+
+
+def transform_and_load_data_from_all_endpoints() -> list[dict]:
     """
     Executes the full transformation and loading pipeline:
       - Connects to MinIO
-      - Retrieves the latest object for each endpoint
-      - Transforms the object using the appropriate function
-      - Uploads the transformed DataFrame to PostgreSQL
-    """
-    minio_host = 'minio:9000'
-    access_key = 'minioadmin'
-    secret_key = 'minioadmin'
-    bucket_name = 'staging'
-
-    ENDPOINTS = {
-        'addresses': addresses.transform,
-        'business_partners': business_partners.transform,
-        'employees': employees.transform,
-        'product_categories': product_categories.transform,
-        'product_category_text': product_category_text.transform,
-        'product_texts': product_texts.transform,
-        'products': products.transform, 
-        'sales_order_items': sales_order_items.transform,
-        'sales_orders': sales_orders.transform,
-    }
+      - Retrieves the latest object for each endpoint, plus the deltas extracted
+        since the last load that have not been merged yet (see `list_pending_objects`)
+      - Transforms each object using the appropriate function
+      - Uploads the transformed DataFrame to PostgreSQL: full snapshots are swapped in
+        atomically, delta extracts are merged by business key
+      - Records each loaded object in the control table; objects with the same content
+        hash as the last loaded one are skipped
 
-    client = connect_to_bucket(minio_host, access_key, secret_key)
+    Endpoints are processed concurrently. Downloads, transforms and loads each run on
+    a bounded pool (DOWNLOAD_MAX_WORKERS, TRANSFORM_MAX_WORKERS, LOAD_MAX_WORKERS), so
+    the wall time approaches that of the slowest endpoint instead of the sum.
 
-    for endpoint, transform_function in ENDPOINTS.items():
-        try:
-            logger.info(f'Processing endpoint: {endpoint}')
-            object_name = get_latest_object_name_for_endpoint(client, bucket_name, endpoint)
-            logger.info(f'Latest object found: {object_name}')
+    Returns:
+        list[dict]: One result per endpoint, see `process_endpoint`.
+    """
+    bucket_name = MINIO_CONFIG['bucket']
+    client = connect_to_bucket(MINIO_CONFIG['host'], MINIO_CONFIG['access_key'], MINIO_CONFIG['secret_key'])
+    last_loads = get_last_loads()
+
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_MAX_WORKERS) as download_executor, \
+            create_transform_executor() as transform_executor, \
+            ThreadPoolExecutor(max_workers=LOAD_MAX_WORKERS) as load_executor, \
+            ThreadPoolExecutor(max_workers=len(TRANSFORMERS)) as endpoint_executor:
 
-            raw_data = get_data_from_latest_object(client, bucket_name, object_name)
-            df = transform_function(raw_data)
+        futures = [
+            endpoint_executor.submit(
+                process_endpoint,
+                endpoint, client, bucket_name, download_executor, transform_executor, load_executor, last_loads
+            )
+            for endpoint in TRANSFORMERS
+        ]
+        results = [future.result() for future in futures]
+
+    for result in results:
+        logger.info(
+            f"{result['endpoint']:<22} {result['status']:<8} rows={result['rows']} "
+            f"seconds={result['seconds']}" + (f" error={result['error']}" if result['error'] else '')
+        )
+
+    failed = [result['endpoint'] for result in results if result['status'] == 'failed']
+    if failed:
+        logger.warning(f'{len(failed)} endpoint(s) failed: {", ".join(failed)}')
+
+    return results
+
+
+def transform_and_load_endpoint(endpoint: str) -> dict:
+    """
+    Transforms and loads the pending staging objects of one endpoint.
+
+    Meant to run as its own task: the stages run one after another in the calling
+    process, and a failure is raised so only this endpoint is retried.
+
+    Args:
+        endpoint (str): Data endpoint (key of TRANSFORMERS).
+
+    Raises:
+        RuntimeError: If the endpoint could not be transformed or loaded.
+
+    Returns:
+        dict: Result of the endpoint, see `process_endpoint`.
+    """
+    bucket_name = MINIO_CONFIG['bucket']
+    client = connect_to_bucket(MINIO_CONFIG['host'], MINIO_CONFIG['access_key'], MINIO_CONFIG['secret_key'])
 
-            logger.info(f'{endpoint} transformation complete.')
-            logger.info(f'DataFrame shape: {df.shape}')
+    # A single worker is enough: process_endpoint waits for each stage before submitting the next
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        result = process_endpoint(endpoint, client, bucket_name, executor, executor, executor, get_last_loads())
 
-            upload_dataframe_to_postgres(df, endpoint, schema='bronze')
-            logger.info(f'{endpoint} uploaded to Postgres.')
+    if result['status'] == 'failed':
+        raise RuntimeError(f"Endpoint {endpoint} failed: {result['error']}")
 
-        except Exception as e:
-            logger.error(f'Error processing endpoint "{endpoint}": {e}')
+    return result
@@ -1,65 +1,65 @@
 import pandas as pd
 
-def transform(raw_data) -> pd.DataFrame:
-    df = pd.read_csv(raw_data)
-
-    df.columns = df.columns.str.lower()
-
-    cols_rename = {'postalcode': 'postal_code', 
-                    'addresstype': 'address_type', 
-                    'validity_startdate': 'dt_start_validity', 
-                    'validity_enddate': 'dt_end_validity'
-                    }
-
-    df.rename(columns=cols_rename, inplace=True)
-
-    df['city'] = df['city'].apply(
-            lambda x: x.encode('latin1').decode('utf-8') if isinstance(x, str) else x
-        )
-
-    df['duplicated_address_id'] = df.duplicated(subset='address_id', keep=False)
-    duplicated_rows = df[df['duplicated_address_id'] == True]
-
-    if duplicated_rows.shape[0] > 0:
-        df.drop_duplicates(subset='address_id', inplace=True)
-        df.reset_index(drop=True, inplace=True)
-
+from transformers.engine import TransformSpec, run_spec
+
+
+def fix_city_encoding(city: pd.Series) -> pd.Series:
+    """
+    Repairs UTF-8 city names that were decoded as latin1.
+
+    Cities repeat a lot, so each distinct name is repaired once and mapped back.
+    """
+    names = city.dropna().unique()
+    fixed = pd.Series(names).str.encode('latin1').str.decode('utf-8')
+
+    return city.map(dict(zip(names, fixed)), na_action='ignore').astype(city.dtype)
+
+
+COUNTRIES = {
+    'US': 'United States of America',
+    'CA': 'Canada',
+    'DE': 'Germany',
+    'GB': 'Great Britain',
+    'AU': 'Australia',
+    'IN': 'India',
+    'DU': 'United Arab Emirates',
+    'FR': 'France'
+}
+
+REGIONS = {
+    'AMER': 'Americas',
+    'EMEA': 'Europe, Middle East and Africa',
+    'APJ': 'Asia Pacific and Japan'
+}
+
+SPEC = TransformSpec(
+    endpoint='addresses',
+    columns={
+        'address_id': 'address_id',
+        'city': 'city',
+        'postalcode': 'postal_code',
+        'street': 'street',
+        'building': 'building',
+        'country': 'country',
+        'region': 'region',
+        'latitude': 'latitude',
+        'longitude': 'longitude'
+    },
+    key=['address_id'],
+    converters={'city': fix_city_encoding},
+    str_cols=[
+        'city',
+        'postal_code',
+        'street',
+        'country',
+        'region'
+    ],
+    code_maps={'country': COUNTRIES, 'region': REGIONS},
+    categories=['country', 'region'],
+    fill_values={'building': 0},
+    dtypes={'building': int}
+)
 
-    df.drop(columns=['duplicated_address_id', 
-                    'dt_start_validity', 
-                    'address_type', 
-                    'dt_end_validity'], inplace=True)
 
-    str_cols = ['city', 
-                'postal_code', 
-                'street', 
-                'country', 
-                'region']
-
-    for col in str_cols:
-        df[col] = df[col].str.strip()
-
-    df['building'] = df['building'].fillna(0).astype(int)
-
-    countries_dict = {
-        'US': 'United States of America',
-        'CA': 'Canada',
-        'DE': 'Germany',
-        'GB': 'Great Britain',
-        'AU': 'Australia',
-        'IN': 'India',
-        'DU': 'United Arab Emirates',
-        'FR': 'France'
-    }
-
-    df['country'] = df['country'].replace(countries_dict)
-
-    regions_dict = {
-        'AMER': 'Americas',
-        'EMEA': 'Europe, Middle East and Africa',
-        'APJ': 'Asia Pacific and Japan'
-    }
-
-    df['region'] = df['region'].replace(regions_dict)
-
-    return df
\ No newline at end of file
+def transform(raw_data) -> pd.DataFrame:
+    return run_spec(SPEC, raw_data)
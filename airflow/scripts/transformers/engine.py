@@ -0,0 +1,288 @@
+import logging
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from staging import STAGING_BATCH_SIZE, STAGING_SCHEMAS, iter_staging_batches, read_staging_data, table_to_dataframe
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TransformSpec:
+    """
+    Declarative description of how the raw data of an endpoint becomes its bronze table.
+
+    The steps run in this order: read only `columns`, with `date_cols` already parsed
+    (%Y%m%d, `null_dates` become NaT) and `categories` dictionary encoded, and rename
+    them, normalize the `key` columns and drop the rows with a missing key, drop
+    duplicated `key` rows (keeping the first), apply `converters`, strip the other
+    `str_cols`, replace codes with `code_maps`, fill `fill_values`, cast `dtypes`,
+    round `round_cols`, add the `derived` columns and finally drop the helper columns
+    listed in `drop`.
+
+    Attributes:
+        endpoint (str): Endpoint name, used to look up its staging schema.
+        columns (dict): Raw column (lower case) -> bronze column, in output order.
+            Raw columns not listed here are never read.
+        key (list): Business key columns used to drop duplicated rows. Rows missing
+            any of them are dropped, as they cannot be loaded under the primary key.
+        converters (dict): Column -> function applied to the whole column.
+        str_cols (list): Columns whose surrounding whitespace is stripped.
+        code_maps (dict): Column -> {code: description} replacements.
+        fill_values (dict): Column -> value filled in for missing values.
+        dtypes (dict): Column -> dtype cast.
+        round_cols (dict): Column -> number of decimals.
+        date_cols (list): Columns holding %Y%m%d dates.
+        null_dates (tuple): Date values meaning "no date".
+        categories (list): Low-cardinality code columns, kept as categoricals.
+        derived (dict): New column -> function of the DataFrame, in output order.
+        drop (list): Columns only needed to build others, removed from the output.
+    """
+    endpoint: str
+    columns: Dict[str, str]
+    key: List[str]
+    converters: Dict[str, Callable[[pd.Series], pd.Series]] = field(default_factory=dict)
+    str_cols: List[str] = field(default_factory=list)
+    code_maps: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    fill_values: Dict[str, object] = field(default_factory=dict)
+    dtypes: Dict[str, str] = field(default_factory=dict)
+    round_cols: Dict[str, int] = field(default_factory=dict)
+    date_cols: List[str] = field(default_factory=list)
+    null_dates: Sequence[str] = ()
+    categories: List[str] = field(default_factory=list)
+    derived: Dict[str, Callable[[pd.DataFrame], pd.Series]] = field(default_factory=dict)
+    drop: List[str] = field(default_factory=list)
+
+
+def map_unique(series: pd.Series, func: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    """
+    Applies `func` to the distinct values of a column only and maps the results back.
+
+    Code and date columns repeat a handful of values over many rows, so this turns
+    one pass of Python-level work per row into one per distinct value. Missing
+    values stay missing.
+
+    Args:
+        series (pd.Series): The column.
+        func (Callable): Function of a Series returning a Series of the same length.
+
+    Returns:
+        pd.Series: The converted column.
+    """
+    codes, uniques = pd.factorize(series)
+    values = func(pd.Series(uniques, dtype=series.dtype))
+    values = values.array if pd.api.types.is_extension_array_dtype(values) else values.to_numpy()
+
+    return pd.Series(pd.api.extensions.take(values, codes, allow_fill=True), index=series.index)
+
+
+def normalize_codes(series: pd.Series, mapping: Optional[Dict[str, str]], strip: bool) -> pd.Series:
+    """
+    Strips and/or replaces the codes of a column, once per distinct code.
+    """
+    def normalize(values: pd.Series) -> pd.Series:
+        if strip:
+            values = values.str.strip()
+        if mapping:
+            values = values.replace(mapping)
+        return values
+
+    dtype = 'category' if isinstance(series.dtype, pd.CategoricalDtype) else series.dtype
+
+    return map_unique(series, normalize).astype(dtype)
+
+
+def staging_read_options(spec: TransformSpec) -> dict:
+    """
+    Builds the staging reader options of a spec: the raw columns it uses with their
+    staging dtypes, and which of them are read as dates or categoricals.
+    """
+    raw_names = {name: raw for raw, name in spec.columns.items()}
+    schema = STAGING_SCHEMAS.get(spec.endpoint, {})
+
+    return {
+        'columns': spec.columns.keys(),
+        'dtypes': {col: dtype for col, dtype in schema.items() if col.lower() in spec.columns},
+        'dates': [raw_names[col] for col in spec.date_cols],
+        'null_dates': spec.null_dates,
+        'categories': [raw_names[col] for col in spec.categories]
+    }
+
+
+def rename_columns(spec: TransformSpec, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Renames raw columns (any case) to their bronze names.
+    """
+    df.columns = df.columns.str.lower()
+    return df.rename(columns=spec.columns)
+
+
+def read_columns(spec: TransformSpec, raw_data) -> pd.DataFrame:
+    """
+    Reads only the raw columns used by a spec, typed: staging dtypes, parsed dates
+    and categoricals.
+
+    Raw data already in memory (a DataFrame typed with the staging schema, as the
+    extractor builds it) goes through the same Arrow conversions as a staging
+    object, so both give the same frame.
+
+    Args:
+        spec (TransformSpec): The table spec.
+        raw_data (BinaryIO | bytes | pd.DataFrame): Content of the staging object,
+            or the extracted data itself.
+
+    Returns:
+        pd.DataFrame: The raw columns, renamed to their bronze names.
+    """
+    options = staging_read_options(spec)
+
+    if isinstance(raw_data, pd.DataFrame):
+        selected = [col for col in raw_data.columns if col.lower() in spec.columns]
+        table = pa.Table.from_pandas(raw_data[selected], preserve_index=False).replace_schema_metadata()
+        df = table_to_dataframe(table, options['dates'], options['null_dates'], options['categories'])
+    else:
+        df = read_staging_data(raw_data, **options)
+
+    return rename_columns(spec, df)
+
+
+class SeenKeys:
+    """
+    Business keys already emitted by a chunked transform, kept as a sorted array of
+    64-bit hashes (8 bytes per key) to drop duplicates across chunks.
+    """
+
+    def __init__(self):
+        self._hashes = np.empty(0, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def first_occurrences(self, keys: pd.DataFrame) -> np.ndarray:
+        """
+        Flags the rows whose key appears for the first time, in this chunk and in
+        the previous ones, and remembers their keys.
+
+        Args:
+            keys (pd.DataFrame): Key columns of the chunk.
+
+        Returns:
+            np.ndarray: Boolean mask of the rows to keep.
+        """
+        hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+        keep = ~pd.Series(hashes).duplicated().to_numpy()
+
+        if len(self._hashes):
+            positions = np.searchsorted(self._hashes, hashes).clip(max=len(self._hashes) - 1)
+            keep &= self._hashes[positions] != hashes
+
+        self._hashes = np.sort(np.concatenate([self._hashes, hashes[keep]]))
+
+        return keep
+
+
+def transform_frame(spec: TransformSpec, df: pd.DataFrame, seen_keys: Optional[SeenKeys] = None) -> pd.DataFrame:
+    """
+    Transforms raw columns (already renamed) as described by a spec.
+
+    Args:
+        spec (TransformSpec): The table spec.
+        df (pd.DataFrame): The raw columns, see `read_columns`.
+        seen_keys (SeenKeys, optional): Keys of the previous chunks, when the data
+            is transformed chunk by chunk. Rows with an already seen key are dropped.
+
+    Returns:
+        pd.DataFrame: The transformed data, columns in spec order.
+    """
+    # Code columns (mapped or categorical) are normalized once per distinct value
+    code_cols = set(spec.code_maps) | set(spec.categories)
+
+    # Key columns are normalized first, so keys only differing by whitespace are duplicates
+    for col in spec.key:
+        if col in code_cols:
+            df[col] = normalize_codes(df[col], spec.code_maps.get(col), strip=col in spec.str_cols)
+        elif col in spec.str_cols:
+            df[col] = df[col].str.strip()
+
+    missing_key = df[spec.key].isna().any(axis=1).to_numpy()
+
+    if missing_key.any():
+        logger.warning(f'Dropping {missing_key.sum()} rows of endpoint "{spec.endpoint}" without a {"/".join(spec.key)} key.')
+        df = df[~missing_key].reset_index(drop=True)
+
+    if seen_keys is not None:
+        duplicated = ~seen_keys.first_occurrences(df[spec.key])
+    else:
+        duplicated = df.duplicated(subset=spec.key).to_numpy()
+
+    if duplicated.any():
+        df = df[~duplicated].reset_index(drop=True)
+
+    for col, converter in spec.converters.items():
+        df[col] = converter(df[col])
+
+    for col in spec.str_cols:
+        if col not in code_cols and col not in spec.key:
+            df[col] = df[col].str.strip()
+
+    for col in code_cols - set(spec.key):
+        df[col] = normalize_codes(df[col], spec.code_maps.get(col), strip=col in spec.str_cols)
+
+    if spec.fill_values:
+        df = df.fillna(spec.fill_values)
+
+    if spec.dtypes:
+        df = df.astype(spec.dtypes)
+
+    for col, decimals in spec.round_cols.items():
+        df[col] = df[col].round(decimals)
+
+    for col, derive in spec.derived.items():
+        df[col] = derive(df)
+
+    output_cols = [col for col in list(spec.columns.values()) + list(spec.derived) if col not in spec.drop]
+
+    return df[output_cols]
+
+
+def run_spec(spec: TransformSpec, raw_data) -> pd.DataFrame:
+    """
+    Transforms the raw data of an endpoint as described by its spec.
+
+    Args:
+        spec (TransformSpec): The table spec.
+        raw_data (BinaryIO | bytes | pd.DataFrame): Content of the staging object,
+            or the extracted data itself (see `read_columns`).
+
+    Returns:
+        pd.DataFrame: The transformed data, columns in spec order.
+    """
+    return transform_frame(spec, read_columns(spec, raw_data))
+
+
+def iter_spec(spec: TransformSpec, source: BinaryIO, batch_size: int = STAGING_BATCH_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Transforms a staging object chunk by chunk, as described by its spec.
+
+    Only one chunk is in memory at a time, plus the hashes of the keys seen so far:
+    a key repeated in a later chunk is dropped, as `run_spec` keeps the first row
+    of each key.
+
+    Args:
+        spec (TransformSpec): The table spec.
+        source (BinaryIO): Seekable staging object.
+        batch_size (int): Maximum number of rows per chunk (Parquet objects).
+
+    Yields:
+        pd.DataFrame: The transformed chunks, at least one (possibly empty).
+    """
+    options = staging_read_options(spec)
+    seen_keys = SeenKeys()
+
+    for table in iter_staging_batches(source, options['columns'], options['dtypes'], batch_size):
+        df = table_to_dataframe(table, options['dates'], options['null_dates'], options['categories'])
+        yield transform_frame(spec, rename_columns(spec, df), seen_keys)
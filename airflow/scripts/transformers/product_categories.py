@@ -1,29 +1,19 @@
 import pandas as pd
 
-def transform(raw_data) -> pd.DataFrame:
-    df = pd.read_csv(raw_data)
-
-    df.columns = df.columns.str.lower()
+from transformers.engine import TransformSpec, run_spec
 
-    cols_rename = {
+SPEC = TransformSpec(
+    endpoint='product_categories',
+    columns={
         'prodcategoryid': 'product_category_id',
         'createdby': 'created_by_id',
         'createdat': 'dt_created_at'
-    }
-
-    df.rename(columns=cols_rename, inplace=True)
-
-    df['duplicated_product_category_id'] = df.duplicated(subset='product_category_id', keep=False)
-    duplicated_rows = df[df['duplicated_product_category_id'] == True]
+    },
+    key=['product_category_id'],
+    str_cols=['product_category_id'],
+    date_cols=['dt_created_at']
+)
 
-    if duplicated_rows.shape[0] > 0:
-        df.drop_duplicates(subset='product_category_id', inplace=True)
-        df.reset_index(drop=True, inplace=True)
 
-    df['dt_created_at'] = pd.to_datetime(df['dt_created_at'].astype(str), format='%Y%m%d')
-
-    df['product_category_id'] = df['product_category_id'].str.strip()
-
-    df.drop(columns=['duplicated_product_category_id',], inplace=True)
-
-    return df
\ No newline at end of file
+def transform(raw_data) -> pd.DataFrame:
+    return run_spec(SPEC, raw_data)
@@ -1,37 +1,22 @@
 import pandas as pd
 
-def transform(raw_data) -> pd.DataFrame:
-    df = pd.read_csv(raw_data)
-
-    df.columns = df.columns.str.lower()
+from transformers.engine import TransformSpec, run_spec
 
-    cols_rename = {
+SPEC = TransformSpec(
+    endpoint='product_texts',
+    columns={
         'productid': 'product_id',
         'short_descr': 'short_description',
-        'medium_descr': 'medium_description',
-        'long_descr': 'long_description'
-    }
-
-    df.rename(columns=cols_rename, inplace=True)
-
-    df['duplicated_product_id'] = df.duplicated(subset='product_id', keep=False)
-    duplicated_rows = df[df['duplicated_product_id'] == True]
-
-    if duplicated_rows.shape[0] > 0:
-        df.drop_duplicates(subset='product_id', inplace=True)
-        df.reset_index(drop=True, inplace=True)
+        'medium_descr': 'medium_description'
+    },
+    key=['product_id'],
+    str_cols=['product_id', 'short_description', 'medium_description'],
+    derived={
+        'product_description': lambda df: df['medium_description'].fillna(df['short_description'])
+    },
+    drop=['short_description', 'medium_description']
+)
 
-    df['product_description'] = df['medium_description'].fillna(df['short_description'])
 
-    df.drop(columns=['duplicated_product_id',
-                    'language',
-                    'short_description',
-                    'medium_description',
-                    'long_description'], inplace=True)
-
-    cols = ['product_id', 'product_description']
-
-    for col in cols:
-        df[col] = df[col].str.strip()
-
-    return df
\ No newline at end of file
+def transform(raw_data) -> pd.DataFrame:
+    return run_spec(SPEC, raw_data)
@@ -1,64 +1,39 @@
 import pandas as pd
 
-def transform(raw_data) -> pd.DataFrame:
-    df = pd.read_csv(raw_data)
-
-    df.columns = df.columns.str.lower()
+from transformers.engine import TransformSpec, run_spec
 
-    cols_rename = {
+SPEC = TransformSpec(
+    endpoint='sales_order_items',
+    columns={
         'salesorderid': 'sales_order_id',
         'salesorderitem': 'sales_order_item',
         'productid': 'product_id',
-        'noteid': 'note_id',
+        'currency': 'currency',
         'grossamount': 'gross_price',
         'netamount': 'net_price',
         'taxamount': 'tax_price',
-        'itematpstatus': 'item_at_p_status',
         'quantity': 'qty',
-        'quantityunit': 'qty_unit',
         'deliverydate': 'dt_delivery'
+    },
+    key=['sales_order_id', 'sales_order_item'],
+    str_cols=['product_id', 'currency'],
+    dtypes={'gross_price': float},
+    round_cols={
+        'gross_price': 2,
+        'net_price': 2,
+        'tax_price': 2
+    },
+    date_cols=['dt_delivery'],
+    null_dates=('29991212',),
+    categories=['currency'],
+    derived={
+        'id_sale_line': lambda df: df['sales_order_id'].astype(str) + '-' + df['sales_order_item'].astype(str),
+        'unit_gross_price': lambda df: (df['gross_price'] / df['qty']).round(2),
+        'unit_net_price': lambda df: (df['net_price'] / df['qty']).round(2),
+        'unit_tax_price': lambda df: (df['tax_price'] / df['qty']).round(2)
     }
+)
 
-    df.rename(columns=cols_rename, inplace=True)
-
-    df['id_sale_line'] = df['sales_order_id'].astype(str) + '-' + df['sales_order_item'].astype(str)
-
-    df['duplicated_id_sale_line'] = df.duplicated(subset='id_sale_line', keep=False)
-    duplicated_rows = df[df['duplicated_id_sale_line'] == True]
-
-    if duplicated_rows.shape[0] > 0:
-        df.drop_duplicates(subset='id_sale_line', inplace=True)
-        df.reset_index(drop=True, inplace=True)
-
-    df.drop(columns=['duplicated_id_sale_line',
-                    'note_id',
-                    'item_at_p_status',
-                    'qty_unit',
-                    'opitempos'], inplace=True)
-
-    str_cols = [
-        'product_id',
-        'currency',
-        'id_sale_line'
-    ]
 
-    for col in str_cols:
-        df[col] = df[col].str.strip()
-
-    df['dt_delivery'] = df['dt_delivery'].astype(str)
-    df['dt_delivery'] = df['dt_delivery'].replace('29991212', pd.NaT)
-
-    df['dt_delivery'] = pd.to_datetime(
-        df['dt_delivery'], 
-        format='%Y%m%d'
-    )
-
-    df['gross_price'] = df['gross_price'].astype(float).round(2)
-    df['net_price'] = df['net_price'].round(2)
-    df['tax_price'] = df['tax_price'].round(2)
-
-    df['unit_gross_price'] = (df['gross_price'] / df['qty']).round(2)
-    df['unit_net_price'] = (df['net_price'] / df['qty']).round(2)
-    df['unit_tax_price'] = (df['tax_price'] / df['qty']).round(2)
-
-    return df
\ No newline at end of file
+def transform(raw_data) -> pd.DataFrame:
+    return run_spec(SPEC, raw_data)
@@ -0,0 +1,53 @@
+"""
+One-off migration creating the indexes the API queries rely on.
+
+The API opens the database strictly read-only, so the indexes are created here,
+once, before it starts (see the sap-api-init service in docker-compose.yml).
+Running it again is a no-op.
+
+Usage:
+    python create_indexes.py [path/to/sap_api.db]
+"""
+import logging
+import sqlite3
+import sys
+
+from main import CHANGE_TRACKING_COLUMN, DB_PATH, DEFAULT_ORDER_BY
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def create_indexes(db_path: str = DB_PATH) -> None:
+    """
+    Creates an index on the default order by column and on the change tracking
+    column of every allowed table.
+
+    Keyset pagination seeks on (order_by, rowid) and incremental pulls filter on
+    the change tracking column; with the indexes these are index range scans
+    instead of full table scans.
+
+    Args:
+        db_path (str): Path to the SQLite database file.
+    """
+    indexed_columns = [*DEFAULT_ORDER_BY.items(), *CHANGE_TRACKING_COLUMN.items()]
+
+    conn = sqlite3.connect(db_path)
+    try:
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+        for table_name, column in indexed_columns:
+            index_name = f'idx_{table_name}_{column.lower()}'
+            if index_name in existing:
+                continue
+
+            conn.execute(f'CREATE INDEX {index_name} ON {table_name} ({column})')
+            logger.info(f'Created index {index_name}')
+
+        conn.commit()
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    create_indexes(sys.argv[1] if len(sys.argv) > 1 else DB_PATH)
@@ -1,11 +1,38 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from functools import partial
+from typing import AsyncIterator, Callable, Iterator, Optional
+import asyncio
+import base64
+import csv
+import io
+import json
+import logging
+import orjson
+import os
 import sqlite3
+import threading
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
 
 # Absolute path to the SQLite database file inside the Docker container
 DB_PATH = '/app/data/sap_api.db'
 
+# Read connection tuning (cache_size is negative, so it is expressed in KiB)
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+SQLITE_CACHE_SIZE = -64 * 1024
+
+# Bounded pool of threads running the blocking SQLite calls (one connection per thread)
+SQLITE_WORKERS = int(os.getenv('SQLITE_WORKERS', '8'))
+_db_executor = ThreadPoolExecutor(max_workers=SQLITE_WORKERS, thread_name_prefix='sqlite')
+
+# Per-thread read-only connections and cached row counts
+_local = threading.local()
+_count_cache: dict[str, tuple[float, int]] = {}
+_count_cache_lock = threading.Lock()
+
 # Tables that are allowed
 ALLOWED_TABLES = {
     'addresses',
@@ -19,6 +46,19 @@ ALLOWED_TABLES = {
     'sales_orders'
 }
 
+# Page size limits for the paginated endpoint
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 5000
+
+# Rows fetched from SQLite per chunk of the streaming export
+EXPORT_CHUNK_SIZE = 1000
+
+# Content types of the streaming export formats
+EXPORT_MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
 # Default order by column for each table
 DEFAULT_ORDER_BY = {
     'addresses': 'ADDRESS_ID',
@@ -32,63 +72,315 @@ DEFAULT_ORDER_BY = {
     'sales_orders': 'SALESORDERID'
 }
 
-def select_table(table_name: str, limit: int, offset: int, order_by: str) -> list[dict]:
+# Last change date column (YYYYMMDD) of the tables that support the 'changed_since' filter
+CHANGE_TRACKING_COLUMN = {
+    'business_partners': 'CHANGEDAT',
+    'products': 'CHANGEDAT',
+    'sales_orders': 'CHANGEDAT'
+}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    _db_executor.shutdown(wait=False)
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+async def run_in_db_executor(func: Callable, *args, **kwargs):
+    """
+    Runs a blocking SQLite call on the bounded database executor.
+
+    The event loop stays free to accept requests while queries run, and the
+    number of concurrent queries is capped at SQLITE_WORKERS.
+
+    Args:
+        func (Callable): Blocking function to run.
+        *args, **kwargs: Arguments passed to `func`.
+
+    Returns:
+        The return value of `func` (exceptions are re-raised in the caller).
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_executor, partial(func, *args, **kwargs))
+
+async def iterate_in_db_executor(iterator: Iterator) -> AsyncIterator:
+    """
+    Consumes a blocking iterator on the database executor, one item at a time.
+
+    Args:
+        iterator (Iterator): Blocking iterator (e.g. `stream_table`).
+
+    Yields:
+        The items produced by `iterator`.
+    """
+    sentinel = object()
+
+    while True:
+        item = await run_in_db_executor(next, iterator, sentinel)
+        if item is sentinel:
+            break
+        yield item
+
+def db_mtime() -> float:
+    """
+    Returns the modification time of the database file, used to invalidate caches.
+    """
+    return os.stat(DB_PATH).st_mtime
+
+def open_read_connection() -> sqlite3.Connection:
+    """
+    Opens a read-only SQLite connection tuned for scans.
+
+    The file is opened in read-only URI mode with `query_only` set, a memory-mapped
+    I/O window (`mmap_size`) and an enlarged page cache (`cache_size`).
+
+    Returns:
+        sqlite3.Connection: A new read-only connection.
+    """
+    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True, check_same_thread=False)
+    conn.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size = {SQLITE_CACHE_SIZE}")
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+def get_connection() -> sqlite3.Connection:
+    """
+    Returns the read-only connection of the current thread, opening it on first use.
+
+    The connection is kept open across requests and reopened when the database
+    file changes on disk.
+
+    Returns:
+        sqlite3.Connection: The thread's persistent read-only connection.
+    """
+    mtime = db_mtime()
+    conn = getattr(_local, 'conn', None)
+
+    if conn is None or _local.mtime != mtime:
+        if conn is not None:
+            conn.close()
+        conn = open_read_connection()
+        _local.conn = conn
+        _local.mtime = mtime
+
+    return conn
+
+def encode_cursor(last_value, last_rowid: int) -> str:
+    """
+    Encodes the sort key of the last returned row as an opaque cursor token.
+
+    Args:
+        last_value: Value of the order by column in the last row.
+        last_rowid (int): SQLite rowid of the last row, used as tie-breaker.
+
+    Returns:
+        str: URL-safe cursor token.
+    """
+    payload = json.dumps([last_value, last_rowid]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Decodes a cursor token produced by `encode_cursor`.
+
+    Args:
+        cursor (str): Cursor token.
+
+    Returns:
+        tuple: (last_value, last_rowid).
+
+    Raises:
+        HTTPException: If the token is malformed.
+    """
+    try:
+        last_value, last_rowid = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return last_value, int(last_rowid)
+
+    except Exception:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor '{cursor}'.")
+
+def changed_since_filter(table_name: str, changed_since: Optional[int]) -> tuple[str, tuple]:
+    """
+    Builds the WHERE condition selecting rows changed on or after a date.
+
+    Args:
+        table_name (str): Name of the table to query.
+        changed_since (int, optional): Date as YYYYMMDD, or None for no filter.
+
+    Returns:
+        tuple[str, tuple]: SQL condition (empty when not filtering) and its parameters.
+
+    Raises:
+        HTTPException: If the table has no change tracking column.
+    """
+    if changed_since is None:
+        return '', ()
+
+    column = CHANGE_TRACKING_COLUMN.get(table_name)
+
+    if not column:
+        raise HTTPException(status_code=400, detail=f"Table '{table_name}' does not support 'changed_since'.")
+
+    return f"{column} >= ?", (changed_since,)
+
+def select_table(
+    table_name: str,
+    limit: int,
+    offset: int,
+    order_by: str,
+    after: Optional[str] = None,
+    changed_since: Optional[int] = None
+) -> tuple[list[dict], Optional[str]]:
     """
     Executes a SELECT query with ORDER BY and pagination on a specific table.
 
+    Rows are ordered by `order_by` with the rowid as tie-breaker. When `after` is
+    given, keyset pagination is used: the query seeks past the cursor instead of
+    skipping `offset` rows, so each page costs the same regardless of position.
+
     Args:
         table_name (str): Name of the table to query.
         limit (int): Number of records to return.
-        offset (int): Number of records to skip.
+        offset (int): Number of records to skip (ignored when `after` is given).
         order_by (str): Column to sort the results by.
+        after (str, optional): Cursor returned by a previous page.
+        changed_since (int, optional): Only return rows changed on or after this date (YYYYMMDD).
 
     Returns:
-        list[dict]: List of records as dictionaries.
+        tuple[list[dict], str | None]: Records as dictionaries and the cursor of
+        the next page (None when there are no more rows).
 
     Raises:
         HTTPException: If the query fails.
     """
+    condition, params = changed_since_filter(table_name, changed_since)
+    conditions = [condition] if condition else []
+
+    if after is not None:
+        last_value, last_rowid = decode_cursor(after)
+        conditions.append(f"({order_by}, rowid) > (?, ?)")
+        params += (last_value, last_rowid)
+        offset = 0
+
+    where = f"WHERE {' AND '.join(conditions)} " if conditions else ''
+    query = f"SELECT rowid AS _rowid, * FROM {table_name} {where}ORDER BY {order_by}, rowid LIMIT ? OFFSET ?"
+    params += (limit, offset)
+
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        query = f"SELECT * FROM {table_name} ORDER BY {order_by} LIMIT {limit} OFFSET {offset}"
-        cur.execute(query)
-        rows = cur.fetchall()
-        return [dict(row) for row in rows]
-    
+        cur = get_connection().cursor()
+        cur.row_factory = sqlite3.Row
+        cur.execute(query, params)
+        rows = [dict(row) for row in cur.fetchall()]
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    
+
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = encode_cursor(rows[-1][order_by], rows[-1]['_rowid'])
+
+    for row in rows:
+        del row['_rowid']
+
+    return rows, next_cursor
+
+def stream_table(
+    table_name: str,
+    order_by: str,
+    fmt: str,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    changed_since: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Streams a whole table, ordered by `order_by`, as NDJSON or CSV text chunks.
+
+    Rows are pulled from a SQLite cursor `chunk_size` at a time, so the table is
+    never materialized in memory. The export uses its own read-only connection,
+    since the generator may be resumed from different worker threads.
+
+    Args:
+        table_name (str): Name of the table to export.
+        order_by (str): Column to sort the results by.
+        fmt (str): Output format, 'ndjson' or 'csv'.
+        chunk_size (int): Number of rows fetched and serialized per chunk.
+        changed_since (int, optional): Only export rows changed on or after this date (YYYYMMDD).
+
+    Yields:
+        bytes: Serialized chunk of rows (the CSV header is sent as its own chunk).
+    """
+    condition, params = changed_since_filter(table_name, changed_since)
+    where = f"WHERE {condition} " if condition else ''
+    conn = open_read_connection()
+
+    try:
+        cur = conn.cursor()
+        cur.execute(f"SELECT * FROM {table_name} {where}ORDER BY {order_by}, rowid", params)
+        columns = [col[0] for col in cur.description]
+
+        if fmt == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator='\n')
+            writer.writerow(columns)
+            yield buffer.getvalue().encode()
+
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                break
+
+            if fmt == 'csv':
+                buffer = io.StringIO()
+                csv.writer(buffer, lineterminator='\n').writerows(rows)
+                yield buffer.getvalue().encode()
+            else:
+                yield b''.join(orjson.dumps(dict(zip(columns, row))) + b'\n' for row in rows)
+
     finally:
         conn.close()
 
-def count_rows(table_name: str) -> int:
+def count_rows(table_name: str, changed_since: Optional[int] = None) -> int:
     """
     Returns the total number of rows in a table.
 
+    Counts are cached per table (and `changed_since` filter) and invalidated
+    when the database file's modification time changes, so `SELECT COUNT(*)`
+    runs once per table instead of once per page request.
+
     Args:
         table_name (str): Table to count rows from.
+        changed_since (int, optional): Only count rows changed on or after this date (YYYYMMDD).
 
     Returns:
         int: Total number of rows in the table.
     """
+    cache_key = f"{table_name}:{changed_since}"
+    mtime = db_mtime()
+
+    with _count_cache_lock:
+        cached = _count_cache.get(cache_key)
+
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    condition, params = changed_since_filter(table_name, changed_since)
+    where = f" WHERE {condition}" if condition else ''
+
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cur = conn.cursor()
-        query = f"SELECT COUNT(*) FROM {table_name}"
-        cur.execute(query)
+        cur = get_connection().cursor()
+        query = f"SELECT COUNT(*) FROM {table_name}{where}"
+        cur.execute(query, params)
         total = cur.fetchone()[0]
-        return total
-    
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error counting rows: {str(e)}")
-    
-    finally:
-        conn.close()
+
+    with _count_cache_lock:
+        _count_cache[cache_key] = (mtime, total)
+
+    return total
 
 @app.get("/")
-def read_root():
+async def read_root():
     """
     Root endpoint that returns basic API information and available endpoints.
 
@@ -101,24 +393,45 @@ def read_root():
             "endpoint": "/{table_name}",
             "description": "Retrieve data from a specific table using pagination.",
             "query_params": {
-                "page": "Page number (starting from 1)"
+                "page": "Page number (starting from 1)",
+                "page_size": f"Records per page (default {DEFAULT_PAGE_SIZE}, maximum {MAX_PAGE_SIZE})",
+                "cursor": "Cursor returned as 'next_cursor' by the previous page (keyset pagination, takes precedence over 'page')",
+                "changed_since": "Only rows changed on or after this date, as YYYYMMDD (tables with a change date only)"
             },
-            "records_per_page": 100,
+            "records_per_page": DEFAULT_PAGE_SIZE,
             "allowed_tables": sorted(list(ALLOWED_TABLES))
+        },
+        "export": {
+            "endpoint": "/{table_name}/export",
+            "description": "Stream a whole table in a single response.",
+            "query_params": {
+                "format": "Output format: 'ndjson' (default) or 'csv'",
+                "changed_since": "Only rows changed on or after this date, as YYYYMMDD (tables with a change date only)"
+            }
         }
     }
 
 @app.get("/{table_name}")
-def get_table_data(
+async def get_table_data(
     table_name: str,
-    page: int = Query(1, gt=0, description="Page number (minimum 1)")
+    page: int = Query(1, gt=0, description="Page number (minimum 1)"),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, gt=0, le=MAX_PAGE_SIZE, description=f"Records per page (maximum {MAX_PAGE_SIZE})"),
+    cursor: Optional[str] = Query(None, description="Cursor of the next page, as returned in 'next_cursor'"),
+    changed_since: Optional[int] = Query(None, description="Only rows changed on or after this date (YYYYMMDD)")
 ):
     """
     Returns a paginated list of records from a specified table.
 
+    Pages can be addressed by number (OFFSET pagination) or by following the
+    `next_cursor` token of the previous response (keyset pagination). Full table
+    dumps should follow cursors, which keeps the total cost linear in table size.
+
     Args:
         table_name (str): Table name (must be in ALLOWED_TABLES).
         page (int): Page number (starting at 1).
+        page_size (int): Number of records per page.
+        cursor (str, optional): Cursor of the next page; takes precedence over `page`.
+        changed_since (int, optional): Only rows changed on or after this date (YYYYMMDD).
 
     Returns:
         dict: Object containing metadata and results.
@@ -129,11 +442,11 @@ def get_table_data(
     if table_name not in ALLOWED_TABLES:
         raise HTTPException(status_code=400, detail=f"Table '{table_name}' is not allowed.")
 
-    limit = 100  # Fixed records per page
-    total_rows = count_rows(table_name)
+    limit = page_size
+    total_rows = await run_in_db_executor(count_rows, table_name, changed_since)
     total_pages = max(1, (total_rows + limit - 1) // limit)
 
-    if page > total_pages:
+    if cursor is None and page > total_pages:
         raise HTTPException(
             status_code=404,
             detail=f"Page {page} is out of range. Total pages: {total_pages}."
@@ -145,13 +458,53 @@ def get_table_data(
     if not order_by:
         raise HTTPException(status_code=500, detail=f"No default 'order_by' field defined for table '{table_name}'.")
 
-    data = select_table(table_name, limit, offset, order_by)
+    data, next_cursor = await run_in_db_executor(
+        select_table, table_name, limit, offset, order_by, after=cursor, changed_since=changed_since
+    )
 
     return {
         "table_name": table_name,
         "total_rows": total_rows,
         "total_pages": total_pages,
-        "page": page,
+        "page": page if cursor is None else None,
+        "page_size": page_size,
         "count": len(data),
+        "next_cursor": next_cursor,
         "results": data
     }
+
+@app.get("/{table_name}/export")
+async def export_table_data(
+    table_name: str,
+    format: str = Query('ndjson', pattern='^(ndjson|csv)$', description="Output format: 'ndjson' or 'csv'"),
+    changed_since: Optional[int] = Query(None, description="Only rows changed on or after this date (YYYYMMDD)")
+):
+    """
+    Streams every record of a specified table in a single chunked response.
+
+    Args:
+        table_name (str): Table name (must be in ALLOWED_TABLES).
+        format (str): Output format, 'ndjson' (one JSON object per line) or 'csv'.
+        changed_since (int, optional): Only rows changed on or after this date (YYYYMMDD).
+
+    Returns:
+        StreamingResponse: The table content, ordered by its default order by column.
+
+    Raises:
+        HTTPException: If the table is not allowed.
+    """
+    if table_name not in ALLOWED_TABLES:
+        raise HTTPException(status_code=400, detail=f"Table '{table_name}' is not allowed.")
+
+    order_by = DEFAULT_ORDER_BY.get(table_name)
+
+    if not order_by:
+        raise HTTPException(status_code=500, detail=f"No default 'order_by' field defined for table '{table_name}'.")
+
+    # Validate the filter before the response starts streaming
+    changed_since_filter(table_name, changed_since)
+
+    return StreamingResponse(
+        iterate_in_db_executor(stream_table(table_name, order_by, format, changed_since=changed_since)),
+        media_type=EXPORT_MEDIA_TYPES[format]
+    )